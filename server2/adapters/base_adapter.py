@@ -153,3 +153,45 @@ class BaseAdapter(ABC):
         except Exception as e:
             logger.error(f"Error processing data: {str(e)}")
             raise
+    
+    def load_chunks(self, source_path, chunksize=100_000):
+        """
+        Load data from the source path in chunks
+        
+        The default implementation loads the whole source as a single chunk.
+        Adapters for formats that can be read incrementally override this.
+        
+        Args:
+            source_path: Path to the data source
+            chunksize: Maximum number of records per chunk
+            
+        Yields:
+            Raw data chunks in their original format
+        """
+        yield self.load_data(source_path)
+    
+    def iter_process(self, source_path, chunksize=100_000):
+        """
+        Process data from source to normalized format, one chunk at a time
+        
+        Args:
+            source_path: Path to the data source
+            chunksize: Maximum number of records per chunk
+            
+        Yields:
+            Pandas DataFrames with normalized data
+        """
+        try:
+            for raw_chunk in self.load_chunks(source_path, chunksize):
+                normalized_chunk = self.normalize(raw_chunk)
+                normalized_chunk = self.ensure_schema(normalized_chunk)
+                
+                # Validate each chunk's schema, as process() does for the whole frame
+                if not self.validate_schema(normalized_chunk):
+                    logger.warning("Schema validation failed after normalization")
+                
+                yield normalized_chunk
+        
+        except Exception as e:
+            logger.error(f"Error processing data: {str(e)}")
+            raise
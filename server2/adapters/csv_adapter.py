@@ -54,6 +54,26 @@ class CSVAdapter(BaseAdapter):
             logger.error(f"Error loading CSV file: {str(e)}")
             raise
     
+    def load_chunks(self, source_path, chunksize=100_000):
+        """
+        Load data from a CSV file in chunks
+        
+        Args:
+            source_path: Path to the CSV file
+            chunksize: Maximum number of rows per chunk
+            
+        Yields:
+            Pandas DataFrames with the raw CSV data
+        """
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"CSV file not found: {source_path}")
+        
+        try:
+            yield from pd.read_csv(source_path, parse_dates=True, chunksize=chunksize)
+        except Exception as e:
+            logger.error(f"Error loading CSV file: {str(e)}")
+            raise
+    
     def _auto_detect_mapping(self, df):
         """
         Attempt to automatically detect column mapping
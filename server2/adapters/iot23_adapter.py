@@ -13,6 +13,15 @@ from utils.logger import get_logger
 # Get logger
 logger = get_logger()
 
+# IoT-23 is typically in TSV format with specific columns
+IOT23_COLUMNS = [
+    'ts', 'uid', 'id.orig_h', 'id.orig_p', 'id.resp_h', 'id.resp_p',
+    'proto', 'service', 'duration', 'orig_bytes', 'resp_bytes',
+    'conn_state', 'local_orig', 'local_resp', 'missed_bytes',
+    'history', 'orig_pkts', 'orig_ip_bytes', 'resp_pkts',
+    'resp_ip_bytes', 'tunnel_parents', 'label', 'detailed_label'
+]
+
 class IoT23Adapter(BaseAdapter):
     """
     Adapter for the IoT-23 dataset.
@@ -39,22 +48,34 @@ class IoT23Adapter(BaseAdapter):
             raise FileNotFoundError(f"IoT-23 file not found: {source_path}")
         
         try:
-            # IoT-23 is typically in TSV format with specific columns
-            columns = [
-                'ts', 'uid', 'id.orig_h', 'id.orig_p', 'id.resp_h', 'id.resp_p',
-                'proto', 'service', 'duration', 'orig_bytes', 'resp_bytes',
-                'conn_state', 'local_orig', 'local_resp', 'missed_bytes',
-                'history', 'orig_pkts', 'orig_ip_bytes', 'resp_pkts',
-                'resp_ip_bytes', 'tunnel_parents', 'label', 'detailed_label'
-            ]
-            
-            df = pd.read_csv(source_path, sep='\t', header=None, names=columns)
+            df = pd.read_csv(source_path, sep='\t', header=None, names=IOT23_COLUMNS)
             logger.info(f"Loaded IoT-23 file with {len(df)} rows")
             return df
         except Exception as e:
             logger.error(f"Error loading IoT-23 file: {str(e)}")
             raise
     
+    def load_chunks(self, source_path, chunksize=100_000):
+        """
+        Load data from an IoT-23 dataset file in chunks
+        
+        Args:
+            source_path: Path to the IoT-23 dataset file
+            chunksize: Maximum number of rows per chunk
+            
+        Yields:
+            Pandas DataFrames with the raw IoT-23 data
+        """
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"IoT-23 file not found: {source_path}")
+        
+        try:
+            yield from pd.read_csv(source_path, sep='\t', header=None, names=IOT23_COLUMNS,
+                                   chunksize=chunksize)
+        except Exception as e:
+            logger.error(f"Error loading IoT-23 file: {str(e)}")
+            raise
+    
     def normalize(self, raw_data):
         """
         Normalize IoT-23 data into standard format
@@ -69,6 +69,44 @@ class JSONAdapter(BaseAdapter):
             logger.error(f"Error loading JSON file: {str(e)}")
             raise
     
+    def load_chunks(self, source_path, chunksize=100_000):
+        """
+        Load data from a JSON file in chunks
+        
+        JSON Lines files (.jsonl) are read incrementally; regular JSON
+        documents are loaded as a single chunk.
+        
+        Args:
+            source_path: Path to the JSON file
+            chunksize: Maximum number of records per chunk
+            
+        Yields:
+            Lists of raw JSON objects
+        """
+        if not source_path.lower().endswith('.jsonl'):
+            yield self.load_data(source_path)
+            return
+        
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"JSON file not found: {source_path}")
+        
+        try:
+            chunk = []
+            with open(source_path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    chunk.append(json.loads(line))
+                    if len(chunk) >= chunksize:
+                        yield chunk
+                        chunk = []
+            if chunk:
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error loading JSON file: {str(e)}")
+            raise
+    
     def _extract_value(self, obj, field, default=None):
         """
         Extract a value from a nested JSON object using dot notation
@@ -5,6 +5,9 @@ This module provides an adapter for receiving and processing data from MQTT brok
 enabling real-time monitoring of IoT devices.
 """
 import json
+import queue
+import threading
+import time
 import pandas as pd
 from datetime import datetime
 import paho.mqtt.client as mqtt
@@ -16,6 +19,12 @@ from services.websocket_manager import manager as ws_manager
 # Get logger
 logger = get_logger()
 
+# Minimum number of seconds between dropped-message warnings
+DROP_LOG_INTERVAL = 1.0
+
+# Default number of processing threads per adapter (mqtt.workers)
+DEFAULT_WORKERS = 2
+
 class MQTTAdapter(BaseAdapter):
     """
     Adapter for MQTT data sources.
@@ -55,6 +64,15 @@ class MQTTAdapter(BaseAdapter):
         # Buffer for collecting messages before processing
         self.message_buffer = []
         self.buffer_size = get_config('mqtt.buffer_size', 10)
+        self.buffer_lock = threading.Lock()
+        
+        # Bounded queue decoupling the network loop from message processing
+        self.message_queue = queue.Queue(maxsize=self.buffer_size * 100)
+        self.num_workers = get_config('mqtt.workers', DEFAULT_WORKERS)
+        self.workers = []
+        self.dropped_messages = 0
+        self._reported_drops = 0
+        self._last_drop_report = float('-inf')
         
     def load_data(self, source_path=None):
         """
@@ -107,7 +125,7 @@ class MQTTAdapter(BaseAdapter):
             # Return empty DataFrame on error
             return pd.DataFrame()
     
-    def _on_connect(self, client, userdata, flags, rc):
+    def _on_connect(self, client, userdata, flags, reason_code, properties):
         """
         Callback for when the client connects to the broker
         
@@ -115,9 +133,10 @@ class MQTTAdapter(BaseAdapter):
             client: MQTT client instance
             userdata: User data
             flags: Connection flags
-            rc: Connection result code
+            reason_code: Connection reason code
+            properties: MQTT v5 properties
         """
-        if rc == 0:
+        if not reason_code.is_failure:
             logger.info(f"Connected to MQTT broker at {self.broker_host}:{self.broker_port}")
             self.connected = True
             
@@ -126,60 +145,134 @@ class MQTTAdapter(BaseAdapter):
                 client.subscribe(topic, qos=self.qos)
                 logger.info(f"Subscribed to topic: {topic}")
         else:
-            logger.error(f"Failed to connect to MQTT broker, return code: {rc}")
+            logger.error(f"Failed to connect to MQTT broker, reason code: {reason_code}")
             self.connected = False
+        
+        self._broadcast_status()
+    
+    def _on_disconnect(self, client, userdata, disconnect_flags, reason_code, properties):
+        """
+        Callback for when the client disconnects from the broker
+        
+        Unexpected disconnects are retried by the client network loop with
+        exponential backoff (see reconnect_delay_set in start).
+        
+        Args:
+            client: MQTT client instance
+            userdata: User data
+            disconnect_flags: Disconnection flags
+            reason_code: Disconnection reason code
+            properties: MQTT v5 properties
+        """
+        self.connected = False
+        
+        if reason_code.is_failure:
+            logger.warning(f"Unexpectedly disconnected from MQTT broker at {self.broker_host}:{self.broker_port} "
+                           f"({reason_code}), reconnecting")
+        else:
+            logger.info(f"Disconnected from MQTT broker at {self.broker_host}:{self.broker_port}")
+        
+        self._broadcast_status()
+    
+    def _broadcast_status(self):
+        """Broadcast the broker connection status to clients"""
+        ws_manager.broadcast({
+            "event": "mqtt_status",
+            "data": {
+                "host": self.broker_host,
+                "port": self.broker_port,
+                "connected": self.connected
+            }
+        })
     
     def _on_message(self, client, userdata, msg):
         """
         Callback for when a message is received from the broker
         
+        Only enqueues the message; decoding and detection run on worker threads.
+        
         Args:
             client: MQTT client instance
             userdata: User data
             msg: MQTT message
         """
+        try:
+            self.message_queue.put_nowait((msg.topic, msg.payload))
+        except queue.Full:
+            self.dropped_messages += 1
+            
+            # Report drops as a periodic summary rather than once per message
+            now = time.monotonic()
+            if now - self._last_drop_report >= DROP_LOG_INTERVAL:
+                logger.warning(f"Message queue full, dropped {self.dropped_messages - self._reported_drops} "
+                               f"message(s) since the last report ({self.dropped_messages} dropped in total)")
+                self._reported_drops = self.dropped_messages
+                self._last_drop_report = now
+    
+    def _worker(self):
+        """Worker thread consuming messages from the message queue"""
+        while True:
+            item = self.message_queue.get()
+            if item is None:
+                break
+            
+            topic, payload = item
+            self._handle_message(topic, payload)
+    
+    def _handle_message(self, topic, payload):
+        """
+        Decode a received message and add it to the processing buffer
+        
+        Args:
+            topic: Topic the message was received on
+            payload: Raw message payload
+        """
         try:
             # Decode message payload
-            payload = msg.payload.decode('utf-8')
-            logger.debug(f"Received message on topic {msg.topic}: {payload}")
+            payload = payload.decode('utf-8')
+            logger.debug(f"Received message on topic {topic}: {payload}")
             
             # Parse JSON payload
             data = json.loads(payload)
 
             # Add topic to data for device_id extraction
-            data['topic'] = msg.topic
+            data['topic'] = topic
 
             # Broadcast raw data update
             ws_manager.broadcast({"event": "data_update", "data": data})
             
             # Add to buffer
-            self.message_buffer.append(data)
+            with self.buffer_lock:
+                self.message_buffer.append(data)
+                buffer_full = len(self.message_buffer) >= self.buffer_size
             
             # Process buffer if it reaches the threshold
-            if len(self.message_buffer) >= self.buffer_size:
+            if buffer_full:
                 self._process_buffer()
         
         except json.JSONDecodeError:
-            logger.warning(f"Received non-JSON message on topic {msg.topic}")
+            logger.warning(f"Received non-JSON message on topic {topic}")
         except Exception as e:
             logger.error(f"Error processing MQTT message: {str(e)}")
     
     def _process_buffer(self):
         """Process the message buffer and detect anomalies"""
-        if not self.message_buffer:
+        # Take the buffered messages and clear the buffer
+        with self.buffer_lock:
+            messages = self.message_buffer
+            self.message_buffer = []
+        
+        if not messages:
             return
         
         try:
             # Normalize all messages in buffer
             normalized_data = pd.DataFrame()
-            for msg in self.message_buffer:
+            for msg in messages:
                 df = self.normalize(msg)
                 if not df.empty:
                     normalized_data = pd.concat([normalized_data, df], ignore_index=True)
             
-            # Clear buffer
-            self.message_buffer = []
-            
             if normalized_data.empty:
                 logger.warning("No valid data to process in buffer")
                 return
@@ -223,11 +316,15 @@ class MQTTAdapter(BaseAdapter):
         """
         try:
             # Create MQTT client
-            self.client = mqtt.Client(client_id=self.client_id)
+            self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=self.client_id)
             
             # Set callbacks
             self.client.on_connect = self._on_connect
             self.client.on_message = self._on_message
+            self.client.on_disconnect = self._on_disconnect
+            
+            # Back off 1s, 2s, 4s, ... up to 60s between reconnect attempts
+            self.client.reconnect_delay_set(min_delay=1, max_delay=60)
             
             # Set authentication if provided
             if self.username and self.password:
@@ -237,6 +334,14 @@ class MQTTAdapter(BaseAdapter):
             logger.info(f"Connecting to MQTT broker at {self.broker_host}:{self.broker_port}")
             self.client.connect(self.broker_host, self.broker_port)
             
+            # Start worker threads for message processing
+            self.workers = [
+                threading.Thread(target=self._worker, daemon=True)
+                for _ in range(self.num_workers)
+            ]
+            for worker in self.workers:
+                worker.start()
+            
             # Start the loop in a non-blocking way
             self.client.loop_start()
             
@@ -255,12 +360,19 @@ class MQTTAdapter(BaseAdapter):
         """
         try:
             if self.client:
-                # Process any remaining messages in buffer
-                self._process_buffer()
-                
                 # Disconnect and stop loop
                 self.client.loop_stop()
                 self.client.disconnect()
+                
+                # Let workers drain the queue, then stop them
+                for _ in self.workers:
+                    self.message_queue.put(None)
+                for worker in self.workers:
+                    worker.join(timeout=5)
+                self.workers = []
+                
+                # Process any remaining messages in buffer
+                self._process_buffer()
                 logger.info("MQTT adapter stopped")
             
             return True
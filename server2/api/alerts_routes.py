@@ -80,7 +80,6 @@ async def get_alerts(
         
         # Convert to list of dicts
         result = [dict(alert) for alert in alerts]
-        conn.close()
         
         return result
     
@@ -132,8 +131,6 @@ async def get_alert_statistics(
         
         daily_counts = {row['day']: row['count'] for row in cursor.fetchall()}
         
-        conn.close()
-        
         return {
             "by_severity": severity_counts,
             "by_status": ack_counts,
@@ -158,8 +155,6 @@ async def get_alert(
         cursor.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,))
         alert = cursor.fetchone()
         
-        conn.close()
-        
         if not alert:
             raise HTTPException(status_code=404, detail=f"Alert with ID {alert_id} not found")
         
@@ -187,7 +182,6 @@ async def update_alert(
         alert = cursor.fetchone()
         
         if not alert:
-            conn.close()
             raise HTTPException(status_code=404, detail=f"Alert with ID {alert_id} not found")
         
         # Build update query
@@ -208,7 +202,6 @@ async def update_alert(
             params.append(datetime.now().isoformat())
         
         if not updates:
-            conn.close()
             return dict(alert)
         
         query += ", ".join(updates)
@@ -223,8 +216,6 @@ async def update_alert(
         cursor.execute("SELECT * FROM alerts WHERE id = ?", (alert_id,))
         updated_alert = cursor.fetchone()
         
-        conn.close()
-        
         logger.info(f"Alert {alert_id} updated by {current_user.username}")
         return dict(updated_alert)
     
@@ -256,7 +247,6 @@ async def acknowledge_all_alerts(
         cursor.execute(query, params)
         count = cursor.rowcount
         conn.commit()
-        conn.close()
         
         logger.info(f"{count} alerts acknowledged by {current_user.username}")
         return {"acknowledged": count}
@@ -13,7 +13,7 @@ from api.auth.models import User, UserCreate, UserUpdate, Token
 from api.auth.utils import (
     authenticate_user, create_access_token, create_refresh_token, get_current_active_user,
     check_admin_role, get_user, get_password_hash, fake_users_db, verify_refresh_token,
-    ACCESS_TOKEN_EXPIRE_MINUTES
+    invalidate_user, ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
 # Get logger
@@ -225,6 +225,7 @@ async def update_user(
         user_dict[field] = value
     
     fake_users_db[username] = user_dict
+    invalidate_user(username)
     
     logger.info(f"User {username} updated by {current_user.username}")
     
@@ -256,5 +257,6 @@ async def delete_user(username: str, current_user: User = Depends(check_admin_ro
     
     # Delete user
     del fake_users_db[username]
+    invalidate_user(username)
     
     logger.info(f"User {username} deleted by {current_user.username}")
@@ -3,6 +3,7 @@ Authentication Utilities
 
 This module provides utilities for password hashing and JWT token generation.
 """
+import time
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from jose import jwt, JWTError
@@ -17,8 +18,8 @@ from api.auth.models import UserInDB, TokenData, User
 # Get logger
 logger = get_logger()
 
-# Password context for hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password context for hashing, built once at import with a fixed bcrypt cost
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
@@ -29,6 +30,12 @@ ALGORITHM = get_config("auth.algorithm", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = get_config("auth.access_token_expire_minutes", 30)
 REFRESH_TOKEN_EXPIRE_DAYS = get_config("auth.refresh_token_expire_days", 7)
 
+# Seconds a looked-up user is served from memory before being rebuilt
+USER_CACHE_TTL = 5.0
+
+# Username -> (lookup time, user) for recently looked-up users
+_user_cache: Dict[str, tuple] = {}
+
 # Mock user database - in production, this would be a real database
 fake_users_db = {
     "admin": {
@@ -86,11 +93,26 @@ def get_user(username: str) -> Optional[UserInDB]:
     Returns:
         User if found, None otherwise
     """
+    cached = _user_cache.get(username)
+    if cached is not None and time.monotonic() - cached[0] < USER_CACHE_TTL:
+        return cached[1]
+    
     if username in fake_users_db:
         user_dict = fake_users_db[username]
-        return UserInDB(**user_dict)
+        user = UserInDB(**user_dict)
+        _user_cache[username] = (time.monotonic(), user)
+        return user
     return None
 
+def invalidate_user(username: str) -> None:
+    """
+    Drop a user from the lookup cache after it has been changed
+    
+    Args:
+        username: Username to invalidate
+    """
+    _user_cache.pop(username, None)
+
 def authenticate_user(username: str, password: str) -> Optional[User]:
     """
     Authenticate a user
@@ -65,8 +65,6 @@ async def get_model_info(
         current_model_row = cursor.fetchone()
         current_model = current_model_row['value'] if current_model_row else 'both'
         
-        conn.close()
-        
         # Return combined information
         return {
             "threshold": threshold,
@@ -111,7 +109,6 @@ async def update_model_settings(
         """, (settings.model,))
         
         conn.commit()
-        conn.close()
         
         logger.info(f"Model settings updated by {current_user.username}: threshold={settings.threshold}, model={settings.model}")
         
@@ -152,7 +149,6 @@ async def start_model_retraining(
         """)
         
         conn.commit()
-        conn.close()
         
         # Start retraining in background
         background_tasks.add_task(retrain_model, request.model)
@@ -85,8 +85,6 @@ async def get_dashboard_statistics(
         # Get anomaly statistics
         anomaly_stats = get_anomaly_statistics(days)
         
-        conn.close()
-        
         # Return combined statistics
         return {
             "anomalies_today": anomalies_today,
@@ -162,8 +160,6 @@ async def get_traffic_statistics(
                 'volume_mb': round(row['volume_mb'], 2)
             }
         
-        conn.close()
-        
         return {
             "hourly_traffic": hourly_traffic,
             "protocol_distribution": protocol_distribution
@@ -9,7 +9,7 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler
 import joblib
 from utils.logger import setup_logger
-from utils.database import get_traffic
+from utils.database import get_traffic_frame
 from ml.dataset_adapter import extract_features_from_traffic, normalize_features
 
 # Setup logger
@@ -22,15 +22,12 @@ SCALER_PATH = os.path.join(MODELS_DIR, 'scaler.pkl')
 def create_scaler():
     """Create and save a scaler for feature normalization"""
     # Get traffic data
-    traffic_data = get_traffic(limit=10000)
+    traffic_df = get_traffic_frame(limit=10000)
     
-    if not traffic_data:
+    if traffic_df.empty:
         logger.error("No traffic data available")
         return False
     
-    # Convert to DataFrame
-    traffic_df = pd.DataFrame(traffic_data)
-    
     # Extract features
     feature_df = extract_features_from_traffic(traffic_df)
     
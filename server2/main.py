@@ -291,6 +291,16 @@ async def startup_event():
     ws_manager.set_loop(asyncio.get_running_loop())
     initialize_system()
 
+# Stop MQTT ingestion on shutdown; disconnecting blocks, so use the executor
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Import here rather than at module level; only shutdown needs the service
+    from services.mqtt_service import get_mqtt_service
+    
+    mqtt_service = get_mqtt_service()
+    if mqtt_service.running:
+        await asyncio.get_running_loop().run_in_executor(None, mqtt_service.stop)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=5000, reload=True)
@@ -13,7 +13,7 @@ from sklearn.ensemble import IsolationForest
 from sklearn.neighbors import LocalOutlierFactor
 from .dataset_adapter import extract_features_from_traffic, normalize_features
 from utils.logger import get_logger
-from utils.database import get_traffic
+from utils.database import get_traffic, get_traffic_frame
 
 # Get logger
 logger = get_logger()
@@ -60,14 +60,11 @@ def load_models():
             logger.info("Training new Isolation Forest model...")
             
             # Get data for training
-            traffic_data = get_traffic(limit=10000)
-            if not traffic_data:
+            traffic_df = get_traffic_frame(limit=10000)
+            if traffic_df.empty:
                 logger.error("No traffic data available for training")
                 return False
             
-            # Convert to DataFrame
-            traffic_df = pd.DataFrame(traffic_data)
-            
             # Extract features
             feature_df = extract_features_from_traffic(traffic_df)
             
@@ -295,14 +292,11 @@ def load_models():
             logger.info("Training new Isolation Forest model...")
             
             # Get data for training
-            traffic_data = get_traffic(limit=10000)
-            if not traffic_data:
+            traffic_df = get_traffic_frame(limit=10000)
+            if traffic_df.empty:
                 logger.error("No traffic data available for training")
                 return False
             
-            # Convert to DataFrame
-            traffic_df = pd.DataFrame(traffic_data)
-            
             # Extract features
             feature_df = extract_features_from_traffic(traffic_df)
             
@@ -546,14 +540,11 @@ def load_models():
             logger.info("Training new Isolation Forest model...")
             
             # Get data for training
-            traffic_data = get_traffic(limit=10000)
-            if not traffic_data:
+            traffic_df = get_traffic_frame(limit=10000)
+            if traffic_df.empty:
                 logger.error("No traffic data available for training")
                 return False
             
-            # Convert to DataFrame
-            traffic_df = pd.DataFrame(traffic_data)
-            
             # Extract features
             feature_df = extract_features_from_traffic(traffic_df)
             
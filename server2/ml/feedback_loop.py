@@ -212,14 +212,16 @@ class FeedbackLoop:
                 f'SELECT * FROM traffic WHERE log_id IN ({",".join(["?"] * len(log_ids))})',
                 log_ids
             )
-            traffic_data = [dict(row) for row in cursor.fetchall()]
+            traffic_data = cursor.fetchall()
             
             if not traffic_data:
                 logger.warning("No traffic data found for feedback items")
                 return False
             
-            # Convert to DataFrame
-            traffic_df = pd.DataFrame(traffic_data)
+            # Convert to DataFrame straight from the row tuples
+            traffic_df = pd.DataFrame.from_records(
+                traffic_data, columns=[col[0] for col in cursor.description]
+            )
             
             # Ensure timestamp is datetime
             if 'timestamp' in traffic_df.columns:
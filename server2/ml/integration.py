@@ -11,7 +11,7 @@ from adapters.adapter_factory import create_adapter
 from ml.generic_anomaly_detector import detect_anomalies
 from utils.logger import get_logger
 from utils.config import get_config
-from utils.database import get_traffic, insert_anomalies
+from utils.database import get_traffic_frame, insert_anomalies
 
 # Get logger
 logger = get_logger()
@@ -41,11 +41,7 @@ def detect_anomalies_from_traffic(traffic_data=None, device_id=None, limit=100,
         # Load traffic data if not provided
         if traffic_data is None:
             logger.info(f"Loading traffic data from database (limit={limit})")
-            traffic_data = get_traffic(limit=limit)
-            
-            # Convert to DataFrame if it's a list of dictionaries
-            if isinstance(traffic_data, list):
-                traffic_data = pd.DataFrame(traffic_data)
+            traffic_data = get_traffic_frame(limit=limit)
         
         # Filter by device ID if provided
         if device_id is not None:
@@ -5,11 +5,10 @@ This module provides a service for managing MQTT connections and processing
 real-time data from IoT devices.
 """
 import os
-import threading
-import time
+from functools import cached_property
 from adapters.mqtt_adapter import MQTTAdapter
 from utils.logger import get_logger
-from utils.config import get_config
+from utils.config import get_config, clear_config_cache
 
 # Get logger
 logger = get_logger()
@@ -26,7 +25,6 @@ class MQTTService:
         """Initialize the MQTT service"""
         self.adapters = {}
         self.running = False
-        self.thread = None
         
         # Load configuration
         self.load_config()
@@ -42,13 +40,15 @@ class MQTTService:
         self.default_qos = get_config('mqtt.qos', 0)
         self.buffer_size = get_config('mqtt.buffer_size', 10)
         self.auto_start = get_config('mqtt.auto_start', False)
-        
-        # Load broker configurations
-        self.broker_configs = get_config('mqtt.brokers', [])
+    
+    @cached_property
+    def broker_configs(self):
+        """Broker configurations, falling back to the default broker (computed once)"""
+        broker_configs = get_config('mqtt.brokers', [])
         
         # If no brokers configured, add default broker
-        if not self.broker_configs:
-            self.broker_configs = [{
+        if not broker_configs:
+            broker_configs = [{
                 'name': 'default',
                 'host': self.default_broker_host,
                 'port': self.default_broker_port,
@@ -57,6 +57,14 @@ class MQTTService:
                 'password': self.default_password,
                 'qos': self.default_qos
             }]
+        
+        return broker_configs
+    
+    def reload(self):
+        """Re-read the configuration file and recompute broker configurations"""
+        clear_config_cache()
+        self.__dict__.pop('broker_configs', None)
+        self.load_config()
     
     def start(self):
         """
@@ -84,10 +92,8 @@ class MQTTService:
                     qos=broker_config.get('qos', self.default_qos)
                 )
             
-            # Start monitoring thread
+            # Reconnects are handled by each adapter's disconnect callback
             self.running = True
-            self.thread = threading.Thread(target=self._monitor_thread, daemon=True)
-            self.thread.start()
             
             logger.info("MQTT service started successfully")
             return True
@@ -112,14 +118,10 @@ class MQTTService:
             logger.info("Stopping MQTT service")
             
             # Stop all adapters
-            for name, adapter in list(self.adapters.items()):
+            for name in tuple(self.adapters):
                 self.remove_broker(name)
             
-            # Stop monitoring thread
             self.running = False
-            if self.thread:
-                self.thread.join(timeout=5)
-                self.thread = None
             
             logger.info("MQTT service stopped successfully")
             return True
@@ -242,29 +244,6 @@ class MQTTService:
         except Exception as e:
             logger.error(f"Error getting broker status: {str(e)}")
             return {'error': str(e)}
-    
-    def _monitor_thread(self):
-        """Thread for monitoring MQTT adapters"""
-        logger.info("MQTT monitoring thread started")
-        
-        while self.running:
-            try:
-                # Check status of all adapters
-                for name, adapter in list(self.adapters.items()):
-                    if not adapter.connected:
-                        logger.warning(f"Broker '{name}' disconnected, attempting to reconnect")
-                        # Try to reconnect
-                        adapter.stop()
-                        adapter.start()
-                
-                # Sleep for a while
-                time.sleep(60)
-            
-            except Exception as e:
-                logger.error(f"Error in MQTT monitoring thread: {str(e)}")
-                time.sleep(10)
-        
-        logger.info("MQTT monitoring thread stopped")
 
 # Singleton instance
 _instance = None
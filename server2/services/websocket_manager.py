@@ -1,39 +1,91 @@
 import asyncio
-import json
-from typing import List
+import orjson
+import pandas as pd
+from datetime import datetime
+from typing import Set
 from fastapi import WebSocket
+from utils.logger import get_logger
+
+# Get logger
+logger = get_logger()
+
+# Maximum number of queued messages coalesced into one frame
+MAX_BATCH_SIZE = 64
+
+def _default(value):
+    """Serialize values orjson does not handle natively, such as pandas Timestamps."""
+    if isinstance(value, datetime):
+        return None if pd.isna(value) else value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def _encode(message: dict) -> bytes | None:
+    """Encode one message, logging and returning None if it cannot be serialized."""
+    try:
+        return orjson.dumps(message, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    except TypeError as e:
+        logger.error(f"Error encoding WebSocket message: {str(e)}")
+        return None
 
 class WebSocketManager:
     """Manages active WebSocket connections and allows broadcasting."""
     def __init__(self) -> None:
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
         self.loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._drainer: asyncio.Task | None = None
 
     def set_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind the manager to the running event loop and start the drain task."""
         self.loop = loop
+        self._queue = asyncio.Queue()
+        self._drainer = loop.create_task(self._drain())
 
     async def connect(self, websocket: WebSocket) -> None:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket) -> None:
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
-    async def _broadcast(self, message: dict) -> None:
-        data = json.dumps(message)
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_text(data)
-            except Exception:
+    async def _broadcast(self, data: bytes) -> None:
+        connections = tuple(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_bytes(data) for connection in connections),
+            return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
                 # Remove broken connections
                 self.disconnect(connection)
 
+    async def _drain(self) -> None:
+        """Send queued messages, coalescing bursts into a single batch frame."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            # Encode messages one by one so a bad message only drops itself
+            encoded = [data for data in map(_encode, batch) if data is not None]
+            if not encoded:
+                continue
+
+            try:
+                if len(encoded) == 1:
+                    await self._broadcast(encoded[0])
+                else:
+                    await self._broadcast(b'{"batch":[' + b','.join(encoded) + b']}')
+            except Exception as e:
+                logger.error(f"Error broadcasting WebSocket messages: {str(e)}")
+
     def broadcast(self, message: dict) -> None:
-        """Broadcast a message to all clients in a thread-safe manner."""
+        """Queue a message for broadcast to all clients in a thread-safe manner."""
         if self.loop is None:
             return
-        asyncio.run_coroutine_threadsafe(self._broadcast(message), self.loop)
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, message)
 
 # Singleton instance
 manager = WebSocketManager()
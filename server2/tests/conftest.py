@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the server tests
+"""
+import os
+import sys
+import logging
+import pytest
+
+# The server modules use absolute imports rooted at server2/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+
+# Keep test runs out of logs/app.log
+for handler in list(get_logger().handlers):
+    if isinstance(handler, logging.FileHandler):
+        get_logger().removeHandler(handler)
+        handler.close()
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """
+    Point utils.database at an empty, initialized database in tmp_path
+    
+    Yields:
+        The utils.database module
+    """
+    from utils import database
+    
+    database.close_db()
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'test.db'))
+    assert database.init_db()
+    
+    yield database
+    
+    database.close_db()
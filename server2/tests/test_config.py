@@ -0,0 +1,73 @@
+"""
+Tests for the configuration utility
+"""
+import os
+import pickle
+import pytest
+from utils import config
+
+@pytest.fixture
+def write_config(tmp_path, monkeypatch):
+    """
+    Point utils.config at a config.yml in tmp_path
+    
+    Returns:
+        Function taking the YAML text and writing it to the config file
+    """
+    config_path = tmp_path / 'config.yml'
+    monkeypatch.setattr(config, 'CONFIG_PATH', str(config_path))
+    monkeypatch.setattr(config, 'CONFIG_CACHE_PATH', str(config_path) + '.cache')
+    config.clear_config_cache()
+    
+    def write(text):
+        config_path.write_text(text)
+        config.clear_config_cache()
+    
+    yield write
+    
+    config.clear_config_cache()
+
+def test_get_config_resolves_paths(write_config):
+    write_config('database:\n  path: data/test.db\n  timeout: 5\n')
+    
+    assert config.get_config('database.path') == 'data/test.db'
+    assert config.get_config('database') == {'path': 'data/test.db', 'timeout': 5}
+    assert config.get_config('database.missing', 'default') == 'default'
+    assert config.get_config('database.path.extra') is None
+    assert config.get_config() == {'database': {'path': 'data/test.db', 'timeout': 5}}
+
+def test_missing_config_file_gives_defaults(write_config):
+    assert config.get_config() == {}
+    assert config.get_config('database.path', 'fallback') == 'fallback'
+    assert not os.path.exists(config.CONFIG_CACHE_PATH)
+
+def test_parsed_config_is_cached(write_config):
+    write_config('mqtt:\n  port: 1883\n')
+    assert config.get_config('mqtt.port') == 1883
+    
+    with open(config.CONFIG_CACHE_PATH, 'rb') as f:
+        assert pickle.load(f) == {'mqtt': {'port': 1883}}
+    
+    # An up-to-date cache is read instead of the YAML file
+    with open(config.CONFIG_CACHE_PATH, 'wb') as f:
+        pickle.dump({'mqtt': {'port': 8883}}, f)
+    config.clear_config_cache()
+    assert config.get_config('mqtt.port') == 8883
+
+def test_stale_cache_is_ignored(write_config):
+    write_config('mqtt:\n  port: 1883\n')
+    assert config.get_config('mqtt.port') == 1883
+    
+    write_config('mqtt:\n  port: 8883\n')
+    cache_mtime = os.stat(config.CONFIG_CACHE_PATH).st_mtime
+    os.utime(config.CONFIG_PATH, (cache_mtime + 10, cache_mtime + 10))
+    
+    assert config.get_config('mqtt.port') == 8883
+
+def test_clear_config_cache_discards_resolved_paths(write_config):
+    write_config('api:\n  port: 8000\n')
+    assert config.get_config('api.port') == 8000
+    
+    os.remove(config.CONFIG_CACHE_PATH)
+    write_config('api:\n  port: 9000\n')
+    assert config.get_config('api.port') == 9000
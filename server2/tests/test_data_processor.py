@@ -0,0 +1,24 @@
+"""
+Tests for the data processing utilities
+"""
+import pandas as pd
+from utils import data_processor
+
+def test_training_data_is_saved_as_feather_by_default(tmp_path):
+    source_path = tmp_path / 'sensor_data.csv'
+    source_path.write_text('id,temperature\n1,20.5\n2,21.0\n')
+    target_path = tmp_path / 'training_data.feather'
+    
+    df = data_processor.prepare_training_data(str(source_path), str(target_path))
+    
+    assert len(df) == 2
+    pd.testing.assert_frame_equal(pd.read_feather(target_path), df)
+
+def test_load_csv_data_infers_types_unless_given(tmp_path):
+    path = tmp_path / 'sensor_data.csv'
+    path.write_text('id,temperature,status\n1,20.5,normal\n')
+    
+    assert data_processor.load_csv_data(str(path))['id'].dtype == 'int64'
+    df = data_processor.load_csv_data(str(path), dtype=data_processor.SENSOR_DTYPES)
+    assert df['id'].tolist() == ['1']
+    assert df['temperature'].dtype == 'float64'
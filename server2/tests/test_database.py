@@ -0,0 +1,168 @@
+"""
+Tests for the SQLite database utilities
+"""
+import threading
+import pandas as pd
+import pyarrow as pa
+import pytest
+import update_schema
+
+def make_anomalies(num_rows, device_id=1):
+    """
+    Build a detected-anomalies frame as produced by the real-time pipeline
+    
+    Args:
+        num_rows: Number of anomalies
+        device_id: Device ID of every anomaly
+    
+    Returns:
+        DataFrame with a datetime64 timestamp column
+    """
+    return pd.DataFrame({
+        'device_id': [device_id] * num_rows,
+        'timestamp': pd.date_range('2024-01-01 10:00:00', periods=num_rows, freq='min'),
+        'src_ip': ['192.168.1.10'] * num_rows,
+        'src_port': [40000 + i for i in range(num_rows)],
+        'dst_ip': ['10.0.0.1'] * num_rows,
+        'dst_port': [443] * num_rows,
+        'protocol': ['tcp'] * num_rows,
+        'combined_score': [0.9] * num_rows,
+        'model_used': ['both'] * num_rows
+    })
+
+def test_insert_anomalies_with_datetime_column(db):
+    assert db.insert_anomalies(make_anomalies(2)) == 2
+    
+    rows = db.get_db_connection().execute('''
+        SELECT a.log_id, a.device_id, a.score, a.model_used, a.detected_at, t.timestamp
+        FROM anomalies a
+        JOIN traffic t ON a.log_id = t.log_id
+        ORDER BY a.log_id
+    ''').fetchall()
+    
+    assert [tuple(row) for row in rows] == [
+        (1, 1, 0.9, 'both', '2024-01-01 10:00:00', '2024-01-01 10:00:00'),
+        (2, 1, 0.9, 'both', '2024-01-01 10:01:00', '2024-01-01 10:01:00')
+    ]
+
+def test_insert_anomalies_continues_log_ids(db):
+    assert db.insert_anomalies(make_anomalies(3)) == 3
+    assert db.insert_anomalies(make_anomalies(2)) == 2
+    
+    log_ids = [row[0] for row in db.get_db_connection().execute('SELECT log_id FROM anomalies ORDER BY log_id')]
+    assert log_ids == [1, 2, 3, 4, 5]
+
+def test_connection_is_reused_per_thread(db):
+    conn = db.get_db_connection()
+    assert db.get_db_connection() is conn
+    
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.get_db_connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+def test_close_db_replaces_thread_connection(db):
+    conn = db.get_db_connection()
+    db.close_db()
+    
+    new_conn = db.get_db_connection()
+    assert new_conn is not conn
+    assert new_conn.execute('SELECT 1').fetchone()[0] == 1
+
+def test_connection_usable_after_schema_update(db):
+    assert db.insert_anomalies(make_anomalies(2)) == 2
+    assert update_schema.update_schema()
+    assert update_schema.populate_initial_alerts() == 2
+    
+    conn = db.get_db_connection()
+    assert not conn.in_transaction
+    assert conn.execute('SELECT COUNT(*) FROM alerts').fetchone()[0] == 2
+
+def test_concurrent_insert_anomalies_assign_distinct_log_ids(db):
+    batches_per_thread = 20
+    barrier = threading.Barrier(2)
+    results = {1: [], 2: []}
+    
+    def insert(device_id):
+        barrier.wait()
+        for _ in range(batches_per_thread):
+            results[device_id].append(db.insert_anomalies(make_anomalies(50, device_id=device_id)))
+    
+    threads = [threading.Thread(target=insert, args=(device_id,)) for device_id in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == {1: [50] * batches_per_thread, 2: [50] * batches_per_thread}
+    
+    conn = db.get_db_connection()
+    traffic = dict(conn.execute('SELECT log_id, device_id FROM traffic').fetchall())
+    anomalies = conn.execute('SELECT log_id, device_id FROM anomalies').fetchall()
+    
+    # Every anomaly has its own log ID, pointing at the traffic row of the same device
+    assert len(traffic) == len(anomalies) == 2 * 50 * batches_per_thread
+    assert len({log_id for log_id, _ in anomalies}) == len(anomalies)
+    assert all(traffic[log_id] == device_id for log_id, device_id in anomalies)
+
+def import_table(db, table, csv_path):
+    """
+    Import a CSV file into a table in its own transaction, as import_csv_to_db does
+    
+    Returns:
+        Number of rows imported
+    """
+    conn = db.get_db_connection()
+    with conn:
+        conn.execute('BEGIN')
+        return db._import_csv_table(conn, table, str(csv_path))
+
+def test_import_csv_table_in_batches(db, tmp_path, monkeypatch):
+    # Small blocks, so the file is read as several record batches
+    monkeypatch.setattr(db, 'IMPORT_BLOCK_SIZE', 256)
+    csv_path = tmp_path / 'links.csv'
+    csv_path.write_text('id,abonent_id,detected_at\n' + ''.join(
+        f'{i},{i % 3},2024-01-01 10:00:{i % 60:02d}\n' for i in range(1, 101)
+    ))
+    
+    assert import_table(db, 'links', csv_path) == 100
+    
+    rows = db.get_db_connection().execute('SELECT * FROM links ORDER BY id').fetchall()
+    assert len(rows) == 100
+    assert tuple(rows[-1]) == (100, 1, '2024-01-01 10:00:40')
+
+def test_failed_import_keeps_previous_table(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'IMPORT_BLOCK_SIZE', 256)
+    csv_path = tmp_path / 'links.csv'
+    csv_path.write_text('id,abonent_id,address_id\n1,1,2\n')
+    assert import_table(db, 'links', csv_path) == 1
+    
+    # A value that does not match the type inferred from the first block
+    csv_path.write_text('id,abonent_id,address_id\n' + ''.join(
+        f'{i},1,2\n' for i in range(1, 101)
+    ) + 'x,1,2\n')
+    with pytest.raises(pa.ArrowInvalid):
+        import_table(db, 'links', csv_path)
+    
+    rows = db.get_db_connection().execute('SELECT * FROM links').fetchall()
+    assert [tuple(row) for row in rows] == [(1, 1, 2)]
+
+def test_anomaly_statistics(db):
+    # SQLite's date('now') is in UTC
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None).floor('s')
+    anomalies = make_anomalies(5)
+    anomalies['timestamp'] = now - pd.to_timedelta([0, 0, 1, 1, 30], unit='D')
+    anomalies['device_id'] = [1, 2, 2, 2, 3]
+    anomalies['model_used'] = ['both', 'lof', 'both', 'both', 'both']
+    assert db.insert_anomalies(anomalies) == 5
+    
+    stats = db.get_anomaly_statistics(days=7)
+    
+    assert stats['total'] == 4
+    assert stats['daily_counts'] == {
+        (now - pd.Timedelta(days=1)).strftime('%Y-%m-%d'): 2,
+        now.strftime('%Y-%m-%d'): 2
+    }
+    assert stats['model_counts'] == {'both': 3, 'lof': 1}
+    assert stats['device_counts'] == {2: 3, 1: 1}
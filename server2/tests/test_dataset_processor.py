@@ -0,0 +1,153 @@
+"""
+Tests for the IoT-23 dataset processor
+"""
+import contextlib
+import pandas as pd
+import pytest
+from utils import dataset_processor
+
+def iot23_line(source_ip, label, detailed_label='-', num_fields=23):
+    """
+    Build a tab-separated conn.log.labeled line
+    
+    Args:
+        source_ip: Originating IP address
+        label: Label field (Malicious/Benign)
+        detailed_label: Detailed label (attack type) field
+        num_fields: Number of leading fields to keep, to simulate truncated lines
+    
+    Returns:
+        The line, without a trailing newline
+    """
+    fields = [
+        '1525879831.015811', 'CUmrqr4svHuSXJy5z7', source_ip, '51524', '65.127.233.163', '23',
+        'tcp', '-', '2.999051', '0', '0', 'S0', '-', '-', '0', 'S', '3', '180', '0', '0', '-',
+        label, detailed_label
+    ]
+    return '\t'.join(fields[:num_fields])
+
+@pytest.fixture
+def write_log(tmp_path, monkeypatch):
+    """
+    Write IoT-23 logs under tmp_path and send processed output there too
+    
+    Returns:
+        Function taking the log lines and returning the log path
+    """
+    monkeypatch.setattr(dataset_processor, 'PROCESSED_DIR', str(tmp_path))
+    
+    def write(lines):
+        path = tmp_path / 'conn.log.labeled'
+        path.write_text('#separator \\x09\n#fields\tts\tuid\n' + '\n'.join(lines) + '\n')
+        return str(path)
+    
+    return write
+
+def object_strings():
+    """
+    Read text columns as object dtype, the default before pandas 3
+    
+    Returns:
+        Context manager
+    """
+    try:
+        pd.get_option('future.infer_string')
+    except KeyError:
+        return contextlib.nullcontext()
+    return pd.option_context('future.infer_string', False)
+
+def read_output(paths, table):
+    return pd.read_csv(paths[table], dtype=str, keep_default_na=False)
+
+def test_truncated_lines_are_skipped_and_missing_labels_default(write_log):
+    paths = dataset_processor.process_iot23_dataset(write_log([
+        iot23_line('192.168.1.1', 'Malicious', 'PartOfAHorizontalPortScan'),
+        iot23_line('192.168.1.2', 'Benign'),
+        iot23_line('192.168.1.3', 'Malicious', num_fields=15),
+        iot23_line('192.168.1.4', 'Malicious', num_fields=21)
+    ]))
+    assert paths is not None
+    
+    traffic = read_output(paths, 'traffic')
+    assert traffic['source_ip'].tolist() == ['192.168.1.1', '192.168.1.2', '192.168.1.4']
+    assert traffic['label'].tolist() == ['Malicious', 'Benign', 'Unknown']
+    assert traffic['attack_type'].tolist() == ['PartOfAHorizontalPortScan', '-', '-']
+    
+    anomalies = read_output(paths, 'anomalies')
+    assert anomalies['source_ip'].tolist() == ['192.168.1.1']
+
+@pytest.mark.parametrize('strings', [contextlib.nullcontext, object_strings])
+def test_benign_first_chunk_keeps_anomaly_columns(write_log, monkeypatch, strings):
+    # One line per chunk, so the first anomaly chunk is empty
+    monkeypatch.setattr(dataset_processor, 'CHUNKSIZE', 1)
+    log_path = write_log([
+        iot23_line('192.168.1.1', 'Benign'),
+        iot23_line('192.168.1.2', 'Malicious', 'C&C'),
+        iot23_line('192.168.1.3', 'Malicious', 'DDoS')
+    ])
+    
+    with strings():
+        paths = dataset_processor.process_iot23_dataset(log_path)
+    assert paths is not None
+    
+    anomalies = read_output(paths, 'anomalies')
+    assert anomalies['source_ip'].tolist() == ['192.168.1.2', '192.168.1.3']
+    assert anomalies['attack_type'].tolist() == ['C&C', 'DDoS']
+    assert anomalies['anomaly_id'].tolist() == ['1', '2']
+    assert anomalies['log_id'].tolist() == ['2', '3']
+    assert list(anomalies.columns) == dataset_processor.ANOMALY_SCHEMA.names
+
+def test_malformed_numeric_fields_count_as_zero(write_log):
+    lines = []
+    for duration, orig_bytes, resp_bytes in [('1.5', '100', '20'), ('-', '-', 'abc'), ('x', '1.5', '1e2')]:
+        fields = iot23_line('192.168.1.1', 'Benign').split('\t')
+        fields[8:11] = [duration, orig_bytes, resp_bytes]
+        lines.append('\t'.join(fields))
+    
+    paths = dataset_processor.process_iot23_dataset(write_log(lines))
+    assert paths is not None
+    
+    traffic = read_output(paths, 'traffic')
+    assert traffic['duration'].astype(float).tolist() == [1.5, 0.0, 0.0]
+    assert traffic['orig_bytes'].tolist() == ['100', '0', '0']
+    assert traffic['resp_bytes'].tolist() == ['20', '0', '100']
+
+@pytest.mark.parametrize('chunksize', [1, dataset_processor.CHUNKSIZE])
+def test_only_lines_starting_with_hash_are_skipped(write_log, monkeypatch, chunksize):
+    # One line per chunk puts the short '#close' line in a chunk of its own
+    monkeypatch.setattr(dataset_processor, 'CHUNKSIZE', chunksize)
+    with_hash = iot23_line('192.168.1.2', 'Malicious', 'C&C').split('\t')
+    with_hash[1] = 'C#uid"1'
+    paths = dataset_processor.process_iot23_dataset(write_log([
+        '\t'.join(['#types'] + ['string'] * 22),
+        iot23_line('192.168.1.1', 'Benign'),
+        '\t'.join(with_hash),
+        '#close\t2018-05-09-15-30-31'
+    ]))
+    assert paths is not None
+    
+    traffic = read_output(paths, 'traffic')
+    assert traffic['source_ip'].tolist() == ['192.168.1.1', '192.168.1.2']
+    assert traffic['uid'].tolist() == ['CUmrqr4svHuSXJy5z7', 'C#uid"1']
+    assert traffic['attack_type'].tolist() == ['-', 'C&C']
+    
+    devices = read_output(paths, 'devices')
+    assert sorted(devices['ip_address']) == ['192.168.1.1', '192.168.1.2', '65.127.233.163']
+
+@pytest.mark.parametrize('chunksize', [1, dataset_processor.CHUNKSIZE])
+def test_lines_with_extra_fields_take_the_last_two_as_labels(write_log, monkeypatch, chunksize):
+    # Lines with too many extra fields are skipped even when they start a chunk
+    monkeypatch.setattr(dataset_processor, 'CHUNKSIZE', chunksize)
+    paths = dataset_processor.process_iot23_dataset(write_log([
+        iot23_line('192.168.1.1', 'Benign'),
+        iot23_line('192.168.1.2', 'Benign') + '\tMalicious\tDDoS',
+        iot23_line('192.168.1.3', 'Benign') + '\t' + '\t'.join(['x'] * 20),
+        iot23_line('192.168.1.4', 'Malicious', 'C&C')
+    ]))
+    assert paths is not None
+    
+    traffic = read_output(paths, 'traffic')
+    assert traffic['source_ip'].tolist() == ['192.168.1.1', '192.168.1.2', '192.168.1.4']
+    assert traffic['label'].tolist() == ['Benign', 'Malicious', 'Malicious']
+    assert traffic['attack_type'].tolist() == ['-', 'DDoS', 'C&C']
+    assert list(traffic.columns) == dataset_processor.TRAFFIC_SCHEMA.names
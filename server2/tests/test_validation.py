@@ -0,0 +1,124 @@
+"""
+Tests for the input validation utilities
+"""
+import orjson
+import pytest
+from flask import Flask
+from utils.validation import validate_request_json, validate_ip_address, validate_timestamp
+
+SCHEMA = {
+    'name': {'type': 'str', 'required': True, 'pattern': r'^[a-z]+$'},
+    'threshold': {'type': 'float', 'min': 0, 'max': 1},
+    'mode': {'choices': ['auto', 'manual', ['custom']]},
+    'ip': {'validator': validate_ip_address}
+}
+
+@pytest.fixture
+def call_view():
+    """
+    Call a view decorated with SCHEMA inside a Flask request context
+    
+    Returns:
+        Function taking the JSON body and returning the view's response
+    """
+    app = Flask(__name__)
+    
+    @validate_request_json(SCHEMA)
+    def view():
+        return 'ok'
+    
+    def call(body):
+        with app.test_request_context(data=orjson.dumps(body), content_type='application/json'):
+            return view()
+    
+    return call
+
+def validation_errors(response):
+    assert response.status_code == 400
+    return [error['message'] for error in orjson.loads(response.get_data())['errors']]
+
+def test_valid_request_reaches_view(call_view):
+    assert call_view({'name': 'sensor', 'threshold': 0.5, 'mode': 'auto', 'ip': '10.0.0.1'}) == 'ok'
+    assert call_view({'name': 'sensor', 'mode': ['custom']}) == 'ok'
+
+def test_missing_json_body(call_view):
+    response = call_view(None)
+    assert response.status_code == 400
+    assert orjson.loads(response.get_data()) == {'status': 'error', 'message': 'No JSON data provided'}
+
+def test_invalid_fields_are_all_reported(call_view):
+    response = call_view({'threshold': 2, 'mode': 'off', 'ip': 'not-an-ip'})
+    assert validation_errors(response) == [
+        "Field 'name' is required",
+        "Field 'threshold' must be at most 1",
+        "Field 'mode' must be one of: auto, manual, ['custom']",
+        'Invalid IP address: not-an-ip'
+    ]
+
+def test_type_and_pattern_checks(call_view):
+    assert validation_errors(call_view({'name': 'Sensor1', 'threshold': 'high'})) == [
+        "Field 'name' must match pattern: ^[a-z]+$",
+        "Field 'threshold' must be a number"
+    ]
+    assert validation_errors(call_view({'name': 5, 'threshold': -1})) == [
+        "Field 'name' must be a string",
+        "Field 'threshold' must be at least 0"
+    ]
+
+def test_unhashable_choice_values_are_compared(call_view):
+    assert validation_errors(call_view({'name': 'sensor', 'mode': ['auto']})) == [
+        "Field 'mode' must be one of: auto, manual, ['custom']"
+    ]
+    assert validation_errors(call_view({'name': 'sensor', 'mode': {'auto': True}})) == [
+        "Field 'mode' must be one of: auto, manual, ['custom']"
+    ]
+
+def test_hashable_choices_use_set_lookup():
+    app = Flask(__name__)
+    
+    @validate_request_json({'level': {'choices': [1, 2, 3]}})
+    def view():
+        return 'ok'
+    
+    with app.test_request_context(json={'level': 2}):
+        assert view() == 'ok'
+    with app.test_request_context(json={'level': [2]}):
+        assert validation_errors(view()) == ["Field 'level' must be one of: 1, 2, 3"]
+
+@pytest.mark.parametrize('value, is_valid', [
+    ('192.168.1.1', True),
+    ('::1', True),
+    ('2001:db8::8a2e:370:7334', True),
+    ('256.1.1.1', False),
+    ('192.168.1', False),
+    ('', False),
+    (None, False)
+])
+def test_validate_ip_address(value, is_valid):
+    assert validate_ip_address(value) == ((True, None) if is_valid else (False, f"Invalid IP address: {value}"))
+
+@pytest.mark.parametrize('value', [
+    '2024-01-05',
+    '2024-01-05 10:11:12',
+    '2024-01-05T10:11:12',
+    '2024-1-5',
+    '2024-01-05T1:2:3',
+    '2024-1-5 1:2:3'
+])
+def test_validate_timestamp_accepts_common_formats(value):
+    assert validate_timestamp(value) == (True, None)
+
+@pytest.mark.parametrize('value', [
+    '2024-13-05',
+    '2024-02-30T00:00:00',
+    '2024-01-05T10:11',
+    '2024-01-05T10:11:12.5',
+    '20240105',
+    ''
+])
+def test_validate_timestamp_rejects_other_formats(value):
+    assert validate_timestamp(value) == (False, f"Invalid timestamp format: {value}")
+
+def test_validate_timestamp_with_format():
+    assert validate_timestamp('05/01/2024', '%d/%m/%Y') == (True, None)
+    assert validate_timestamp('2024-01-05', '%d/%m/%Y') == (False, 'Invalid timestamp: 2024-01-05')
@@ -0,0 +1,62 @@
+"""
+Tests for the WebSocket broadcast manager
+"""
+import asyncio
+import orjson
+import pandas as pd
+from services.websocket_manager import WebSocketManager
+
+class FakeWebSocket:
+    """Collects the frames sent to a client"""
+    def __init__(self):
+        self.frames = []
+    
+    async def send_bytes(self, data):
+        self.frames.append(orjson.loads(data))
+
+def broadcast_all(messages):
+    """
+    Queue messages on a fresh manager and let it drain them
+    
+    Args:
+        messages: Messages to broadcast
+    
+    Returns:
+        Frames received by a connected client
+    """
+    async def run():
+        manager = WebSocketManager()
+        manager.set_loop(asyncio.get_running_loop())
+        client = FakeWebSocket()
+        manager.active_connections.add(client)
+        for message in messages:
+            manager.broadcast(message)
+        
+        # Let the queued puts and the drain task run
+        for _ in range(5):
+            await asyncio.sleep(0)
+        manager._drainer.cancel()
+        return client.frames
+    
+    return asyncio.run(run())
+
+def test_bad_message_does_not_drop_the_batch():
+    frames = broadcast_all([
+        {"event": "data_update", "data": {"device_id": 1}},
+        {"event": "unknown", "data": object()},
+        {"event": "data_update", "data": {"device_id": 2}}
+    ])
+    assert frames == [{"batch": [
+        {"event": "data_update", "data": {"device_id": 1}},
+        {"event": "data_update", "data": {"device_id": 2}}
+    ]}]
+
+def test_anomaly_alert_timestamps_are_serialized():
+    anomaly = {"timestamp": pd.Timestamp('2024-01-01 10:00:00'), "detected_at": pd.NaT, "score": 0.9}
+    frames = broadcast_all([{"event": "anomaly_alert", "data": anomaly}])
+    assert frames == [{"event": "anomaly_alert", "data": {
+        "timestamp": "2024-01-01T10:00:00", "detected_at": None, "score": 0.9
+    }}]
+
+def test_single_message_is_sent_unbatched():
+    assert broadcast_all([{"event": "data_update", "data": []}]) == [{"event": "data_update", "data": []}]
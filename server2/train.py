@@ -7,6 +7,7 @@ it for training.
 """
 import os
 import argparse
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from adapters.adapter_factory import create_adapter
@@ -38,6 +39,35 @@ def parse_args():
     
     return parser.parse_args()
 
+def reservoir_sample(chunks, limit, random_state=42):
+    """
+    Draw a uniform random sample of rows from a stream of DataFrame chunks
+    
+    Each row gets a random key and only the rows with the smallest keys are
+    kept, so at most limit rows plus one chunk are held in memory.
+    
+    Args:
+        chunks: Iterable of DataFrames
+        limit: Number of rows to sample
+        random_state: Seed for the random number generator
+    
+    Returns:
+        DataFrame with at most limit rows
+    """
+    rng = np.random.default_rng(random_state)
+    reservoir = None
+    
+    for chunk in chunks:
+        chunk = chunk.assign(_sample_key=rng.random(len(chunk)))
+        if reservoir is not None:
+            chunk = pd.concat([reservoir, chunk], ignore_index=True)
+        reservoir = chunk.nsmallest(limit, '_sample_key') if len(chunk) > limit else chunk
+    
+    if reservoir is None:
+        return pd.DataFrame()
+    
+    return reservoir.drop(columns='_sample_key').reset_index(drop=True)
+
 def main():
     """Main function"""
     # Parse arguments
@@ -52,14 +82,16 @@ def main():
         # Create adapter
         adapter = create_adapter(args.input, args.adapter)
         
-        # Load and normalize data
+        # Load and normalize data chunk by chunk
         logger.info("Loading and normalizing data...")
-        normalized_data = adapter.process(args.input)
+        chunks = adapter.iter_process(args.input)
         
         # Limit samples if requested
-        if args.limit and len(normalized_data) > args.limit:
+        if args.limit:
             logger.info(f"Limiting to {args.limit} samples")
-            normalized_data = normalized_data.sample(args.limit, random_state=42)
+            normalized_data = reservoir_sample(chunks, args.limit)
+        else:
+            normalized_data = pd.concat(chunks, ignore_index=True)
         
         logger.info(f"Normalized data shape: {normalized_data.shape}")
         
@@ -10,7 +10,7 @@ import os
 import sqlite3
 from datetime import datetime
 from utils.logger import get_logger
-from utils.database import DB_PATH, get_db_connection
+from utils.database import DB_PATH, get_db_connection, close_db
 
 # Setup logger
 logger = get_logger()
@@ -23,6 +23,8 @@ def update_schema():
         Boolean indicating success
     """
     try:
+        # The connection is in autocommit mode, so all DDL below commits
+        # together under the explicit BEGIN IMMEDIATE
         conn = get_db_connection()
         cursor = conn.cursor()
         
@@ -32,8 +34,18 @@ def update_schema():
             logger.error("Database not initialized. Please run init_db() first.")
             return False
         
+        # Enable WAL so readers are not blocked during and after the update
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        
+        # ALTER TABLE rewrites whole tables, so give this connection a large
+        # page cache, in-memory temp storage and mmapped reads
+        cursor.execute("PRAGMA cache_size=-262144")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        
         # Begin transaction
-        cursor.execute("BEGIN TRANSACTION")
+        cursor.execute("BEGIN IMMEDIATE")
         
         # 1. Update devices table
         logger.info("Updating devices table...")
@@ -80,7 +92,12 @@ def update_schema():
         
         # Commit changes
         conn.commit()
-        conn.close()
+        
+        # Refresh query planner statistics for the altered tables
+        cursor.execute("PRAGMA optimize")
+        
+        # Discard this thread's connection along with the migration pragmas
+        close_db()
         
         logger.info("Database schema updated successfully")
         return True
@@ -89,7 +106,7 @@ def update_schema():
         # Rollback in case of error
         if conn:
             conn.rollback()
-            conn.close()
+            close_db()
         logger.error(f"Error updating database schema: {str(e)}")
         return False
 
@@ -104,19 +121,29 @@ def populate_initial_alerts():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get existing anomalies
+        # Get existing anomalies together with their device names
         cursor.execute("""
-        SELECT anomaly_id, device_id, score, detected_at 
-        FROM anomalies 
-        WHERE is_genuine = 1
-        ORDER BY detected_at DESC
+        SELECT a.anomaly_id, a.device_id, a.score, a.detected_at, d.name
+        FROM anomalies a
+        LEFT JOIN devices d USING (device_id)
+        WHERE a.is_genuine = 1
+        ORDER BY a.detected_at DESC
         LIMIT 100
         """)
         
         anomalies = cursor.fetchall()
-        count = 0
         
+        # Get anomalies that already have an alert
+        cursor.execute("SELECT anomaly_id FROM alerts")
+        seen = {row['anomaly_id'] for row in cursor.fetchall()}
+        
+        alerts = []
         for anomaly in anomalies:
+            # Skip anomalies that already have an alert
+            if anomaly['anomaly_id'] in seen:
+                continue
+            seen.add(anomaly['anomaly_id'])
+            
             # Determine severity based on score
             score = anomaly['score']
             if score >= 0.9:
@@ -128,27 +155,21 @@ def populate_initial_alerts():
             
             # Create alert message
             device_id = anomaly['device_id']
-            cursor.execute("SELECT name FROM devices WHERE device_id = ?", (device_id,))
-            device = cursor.fetchone()
-            device_name = device['name'] if device and device['name'] else f"Device {device_id}"
+            device_name = anomaly['name'] or f"Device {device_id}"
             
             message = f"Anomaly detected on {device_name} with score {score:.2f}"
             
-            # Check if alert already exists
-            cursor.execute("""
-            SELECT id FROM alerts WHERE anomaly_id = ?
-            """, (anomaly['anomaly_id'],))
-            
-            if not cursor.fetchone():
-                # Insert new alert
-                cursor.execute("""
-                INSERT INTO alerts (anomaly_id, raised_at, severity, message, acknowledged)
-                VALUES (?, ?, ?, ?, 0)
-                """, (anomaly['anomaly_id'], anomaly['detected_at'], severity, message))
-                count += 1
+            alerts.append((anomaly['anomaly_id'], anomaly['detected_at'], severity, message))
         
-        conn.commit()
-        conn.close()
+        # Insert new alerts in one transaction; the connection context
+        # commits on success and rolls back on error
+        with conn:
+            cursor.execute("BEGIN")
+            cursor.executemany("""
+            INSERT INTO alerts (anomaly_id, raised_at, severity, message, acknowledged)
+            VALUES (?, ?, ?, ?, 0)
+            """, alerts)
+        count = len(alerts)
         
         logger.info(f"Created {count} initial alerts")
         return count
@@ -4,7 +4,9 @@ Configuration Utility
 This module provides functions for loading and accessing configuration settings.
 """
 import os
+import pickle
 import yaml
+from functools import lru_cache
 from utils.logger import get_logger
 
 # Get logger
@@ -12,10 +14,20 @@ logger = get_logger()
 
 # Constants
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.yml')
+CONFIG_CACHE_PATH = CONFIG_PATH + '.cache'
+
+# Prefer the libyaml C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 # Global configuration
 _config = None
 
+# Flattened view of the configuration keyed by dot-separated path
+_flat = {}
+
+# Sentinel for paths that are not present in the configuration
+_MISSING = object()
+
 def load_config():
     """
     Load configuration from YAML file
@@ -23,30 +35,108 @@ def load_config():
     Returns:
         Dictionary containing configuration
     """
-    global _config
+    global _config, _flat
+    
+    # Check if config is already loaded
+    if _config is not None:
+        return _config
+    
+    _config = _read_config()
+    _flat = _flatten_config(_config)
+    return _config
+
+def _read_config():
+    """
+    Read configuration from the cache or the YAML file
     
+    Returns:
+        Dictionary containing configuration
+    """
     try:
-        # Check if config is already loaded
-        if _config is not None:
-            return _config
-        
         # Check if config file exists
         if not os.path.exists(CONFIG_PATH):
             logger.warning(f"Configuration file not found: {CONFIG_PATH}")
-            _config = {}
-            return _config
+            return {}
+        
+        # Use the cached copy if it is at least as new as the YAML file
+        cached = _load_cached_config()
+        if cached is not None:
+            logger.info(f"Loaded configuration from {CONFIG_CACHE_PATH}")
+            return cached
         
         # Load config from file
         with open(CONFIG_PATH, 'r') as f:
-            _config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
+        
+        _save_cached_config(config)
         
         logger.info(f"Loaded configuration from {CONFIG_PATH}")
-        return _config
+        return config
     
     except Exception as e:
         logger.error(f"Error loading configuration: {str(e)}")
-        _config = {}
-        return _config
+        return {}
+
+def _flatten_config(config, prefix='', flat=None):
+    """
+    Flatten nested configuration into a dict keyed by dot-separated paths
+    
+    Both leaves and intermediate dictionaries are stored, so any path that
+    resolves in the nested config resolves with a single lookup.
+    
+    Args:
+        config: Nested configuration dictionary
+        prefix: Path prefix for keys at this level
+        flat: Dictionary to populate
+    
+    Returns:
+        Flattened configuration dictionary
+    """
+    if flat is None:
+        flat = {}
+    
+    if not isinstance(config, dict):
+        return flat
+    
+    for key, value in config.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            _flatten_config(value, f"{path}.", flat)
+    
+    return flat
+
+def _load_cached_config():
+    """
+    Load the pickled configuration cache if it is up to date
+    
+    Returns:
+        Cached configuration dictionary, or None if missing or stale
+    """
+    try:
+        if os.stat(CONFIG_CACHE_PATH).st_mtime < os.stat(CONFIG_PATH).st_mtime:
+            return None
+        with open(CONFIG_CACHE_PATH, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def _save_cached_config(config):
+    """
+    Atomically write the parsed configuration to the cache file
+    
+    Args:
+        config: Parsed configuration dictionary
+    """
+    tmp_path = f"{CONFIG_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, CONFIG_CACHE_PATH)
+    except Exception as e:
+        logger.warning(f"Could not write configuration cache: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 def get_config(path=None, default=None):
     """
@@ -66,18 +156,29 @@ def get_config(path=None, default=None):
     if path is None:
         return config
     
-    # Split path into parts
-    parts = path.split('.')
+    value = _resolve(path)
+    return default if value is _MISSING else value
+
+@lru_cache(maxsize=256)
+def _resolve(path):
+    """
+    Resolve a dot-separated path against the loaded configuration
+    
+    Args:
+        path: Dot-separated path to configuration value
     
-    # Navigate through config
-    current = config
-    for part in parts:
-        if isinstance(current, dict) and part in current:
-            current = current[part]
-        else:
-            return default
+    Returns:
+        Configuration value or _MISSING if path not found
+    """
+    return _flat.get(path, _MISSING)
+
+def clear_config_cache():
+    """Discard the loaded configuration and all cached lookups"""
+    global _config, _flat
     
-    return current
+    _resolve.cache_clear()
+    _config = None
+    _flat = {}
 
 # Load configuration on module import
 load_config()
@@ -10,62 +10,94 @@ from utils.logger import get_logger
 # Get logger
 logger = get_logger()
 
-def load_csv_data(file_path):
+# Known column types of the sensor data, so CSV reads can skip type inference
+SENSOR_DTYPES = {
+    'id': str,
+    'timestamp': str,
+    'temperature': 'float64',
+    'humidity': 'float64',
+    'pressure': 'float64',
+    'vibration': 'float64',
+    'status': str
+}
+
+# Directories already created by _ensure_dir
+_created_dirs = set()
+
+def _ensure_dir(file_path):
+    """
+    Create the parent directory of a file once per process
+    
+    Args:
+        file_path: Path of the file about to be written
     """
-    Load data from a CSV file
+    directory = os.path.dirname(file_path)
+    if directory and directory not in _created_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _created_dirs.add(directory)
+
+def load_csv_data(file_path, format='csv', dtype=None):
+    """
+    Load data from a CSV or Feather file
     
     Args:
-        file_path: Path to the CSV file
+        file_path: Path to the data file
+        format: File format ('csv' or 'feather')
+        dtype: Optional column types for CSV files (e.g. SENSOR_DTYPES)
     
     Returns:
         DataFrame containing the data
     """
     try:
-        df = pd.read_csv(file_path)
+        if format == 'feather':
+            df = pd.read_feather(file_path)
+        else:
+            df = pd.read_csv(file_path, dtype=dtype)
         logger.info(f"Loaded {len(df)} records from {file_path}")
         return df
     except Exception as e:
         logger.error(f"Error loading data from {file_path}: {str(e)}")
         return pd.DataFrame()
 
-def prepare_training_data(source_path=None, target_path=None):
+def prepare_training_data(source_path=None, target_path=None, format='feather'):
     """
     Prepare training data for anomaly detection models
     
     Args:
         source_path: Path to the source data file
         target_path: Path to save the processed training data
+        format: Format of the saved training data ('feather' or 'csv')
     
     Returns:
         DataFrame containing the processed training data
     """
     # Default paths
+    dtype = None
     if source_path is None:
         source_path = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
             'public', 'data', 'iot_sensor_data.csv'
         )
+        # The bundled sensor data has known column types
+        dtype = SENSOR_DTYPES
     
     if target_path is None:
         target_path = os.path.join(
             os.path.dirname(os.path.dirname(__file__)),
-            'data', 'training_data.csv'
+            'data', f'training_data.{format}'
         )
     
     try:
         # Load data
-        df = load_csv_data(source_path)
+        df = load_csv_data(source_path, dtype=dtype)
         
         if df.empty:
             logger.error("No data loaded for training")
             return df
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(target_path), exist_ok=True)
-        
         # Save processed data
-        df.to_csv(target_path, index=False)
-        logger.info(f"Saved {len(df)} records to {target_path}")
+        if not save_to_csv(df, target_path, format=format):
+            return pd.DataFrame()
         
         return df
     
@@ -90,17 +122,14 @@ def generate_synthetic_data(num_devices=3, num_days=7, interval_minutes=15, anom
         # Calculate number of readings per device
         readings_per_day = 24 * 60 // interval_minutes
         total_readings = num_days * readings_per_day
+        num_readings = num_devices * total_readings
         
-        # Initialize data storage
-        data = []
+        rng = np.random.default_rng()
         
         # Generate timestamps
         end_time = datetime.now()
         start_time = end_time - timedelta(days=num_days)
-        timestamps = [
-            start_time + timedelta(minutes=i*interval_minutes)
-            for i in range(total_readings)
-        ]
+        timestamps = pd.date_range(start_time, periods=total_readings, freq=f'{interval_minutes}min')
         
         # Normal ranges for each sensor type
         normal_ranges = {
@@ -118,64 +147,57 @@ def generate_synthetic_data(num_devices=3, num_days=7, interval_minutes=15, anom
             'vibration': [(0, 2), (15, 25)]
         }
         
-        # Generate data for each device
-        for device_id in range(1, num_devices + 1):
-            device_name = f"device{device_id}"
-            
-            # Generate readings for this device
-            for timestamp in timestamps:
-                # Determine if this reading should be anomalous
-                is_anomaly = np.random.random() < anomaly_rate
-                status = 'normal'
-                
-                # Generate sensor values
-                if is_anomaly:
-                    # Choose which sensor will be anomalous
-                    anomalous_sensor = np.random.choice(list(normal_ranges.keys()))
-                    
-                    # Generate values
-                    temperature = np.random.uniform(*normal_ranges['temperature'])
-                    humidity = np.random.uniform(*normal_ranges['humidity'])
-                    pressure = np.random.uniform(*normal_ranges['pressure'])
-                    vibration = np.random.uniform(*normal_ranges['vibration'])
-                    
-                    # Make the chosen sensor anomalous
-                    anomaly_range = np.random.choice(anomaly_ranges[anomalous_sensor])
-                    if anomalous_sensor == 'temperature':
-                        temperature = np.random.uniform(*anomaly_range)
-                        status = 'warning' if temperature < 85 else 'critical'
-                    elif anomalous_sensor == 'humidity':
-                        humidity = np.random.uniform(*anomaly_range)
-                        status = 'warning' if humidity < 70 else 'critical'
-                    elif anomalous_sensor == 'pressure':
-                        pressure = np.random.uniform(*anomaly_range)
-                        status = 'warning'
-                    elif anomalous_sensor == 'vibration':
-                        vibration = np.random.uniform(*anomaly_range)
-                        status = 'warning' if vibration < 15 else 'critical'
-                else:
-                    # Generate normal values with some random variation
-                    temperature = np.random.uniform(*normal_ranges['temperature'])
-                    humidity = np.random.uniform(*normal_ranges['humidity'])
-                    pressure = np.random.uniform(*normal_ranges['pressure'])
-                    vibration = np.random.uniform(*normal_ranges['vibration'])
-                
-                # Add reading to data
-                data.append({
-                    'id': device_name,
-                    'timestamp': timestamp.strftime('%Y-%m-%dT%H:%M:%S'),
-                    'temperature': round(temperature, 1),
-                    'humidity': round(humidity, 1),
-                    'pressure': round(pressure, 1),
-                    'vibration': round(vibration, 1),
-                    'status': status
-                })
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
-        
-        # Sort by timestamp
-        df = df.sort_values('timestamp')
+        # Anomalous values at or above these are critical rather than warning
+        critical_thresholds = {
+            'temperature': 85,
+            'humidity': 70,
+            'vibration': 15
+        }
+        
+        sensors = list(normal_ranges.keys())
+        
+        # Generate normal values for every reading, all sensors in one call;
+        # each sensor gets a contiguous row of the block
+        lows, highs = np.array(list(normal_ranges.values())).T
+        block = rng.uniform(lows[:, None], highs[:, None], (len(sensors), num_readings))
+        values = dict(zip(sensors, block))
+        
+        # Determine which readings are anomalous, which sensor and which range
+        is_anomaly = rng.random(num_readings) < anomaly_rate
+        anomalous_sensor = rng.integers(0, len(sensors), num_readings)
+        anomaly_side = rng.integers(0, 2, num_readings)
+        
+        # Overwrite the chosen sensor of each anomalous reading
+        for index, sensor in enumerate(sensors):
+            mask = is_anomaly & (anomalous_sensor == index)
+            ranges = np.array(anomaly_ranges[sensor])[anomaly_side[mask]]
+            values[sensor][mask] = rng.uniform(ranges[:, 0], ranges[:, 1])
+        
+        # Label all readings at once: critical past a threshold, otherwise warning
+        is_critical = np.zeros(num_readings, dtype=bool)
+        for sensor, threshold in critical_thresholds.items():
+            is_critical |= (anomalous_sensor == sensors.index(sensor)) & (values[sensor] >= threshold)
+        status = np.select(
+            [is_anomaly & is_critical, is_anomaly],
+            ['critical', 'warning'],
+            default='normal'
+        )
+        
+        # Round readings to one decimal in place
+        for sensor in sensors:
+            np.round(values[sensor], 1, out=values[sensor])
+        
+        # Build the DataFrame from column arrays in timestamp-major order,
+        # so readings come out already sorted by time
+        df = pd.DataFrame({
+            'id': np.tile([f"device{device_id}" for device_id in range(1, num_devices + 1)], total_readings),
+            'timestamp': np.repeat(timestamps.strftime('%Y-%m-%dT%H:%M:%S'), num_devices),
+            'temperature': values['temperature'],
+            'humidity': values['humidity'],
+            'pressure': values['pressure'],
+            'vibration': values['vibration'],
+            'status': status
+        })
         
         logger.info(f"Generated {len(df)} synthetic readings for {num_devices} devices")
         return df
@@ -184,23 +206,30 @@ def generate_synthetic_data(num_devices=3, num_days=7, interval_minutes=15, anom
         logger.error(f"Error generating synthetic data: {str(e)}")
         return pd.DataFrame()
 
-def save_to_csv(df, file_path):
+def save_to_csv(df, file_path, format='csv'):
     """
-    Save DataFrame to CSV file
+    Save DataFrame to a CSV or Feather file
+    
+    Feather (zstd-compressed) is preferred for internal intermediate files;
+    CSV is kept for interoperability with external tools.
     
     Args:
         df: DataFrame to save
-        file_path: Path to save the CSV file
+        file_path: Path to save the file
+        format: File format ('csv' or 'feather')
     
     Returns:
         Boolean indicating success
     """
     try:
         # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _ensure_dir(file_path)
         
-        # Save to CSV
-        df.to_csv(file_path, index=False)
+        # Save in the requested format
+        if format == 'feather':
+            df.reset_index(drop=True).to_feather(file_path, compression='zstd')
+        else:
+            df.to_csv(file_path, index=False)
         logger.info(f"Saved {len(df)} records to {file_path}")
         return True
     
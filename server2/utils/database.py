@@ -4,8 +4,10 @@ Database utility for the IoT Anomaly Detection System
 This module provides functions for database operations.
 """
 import os
+import atexit
 import sqlite3
-import pandas as pd
+import threading
+from collections import Counter
 from datetime import datetime
 from utils.logger import get_logger
 
@@ -16,20 +18,79 @@ logger = get_logger()
 DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 DB_PATH = os.path.join(DB_DIR, 'iot_anomaly.db')
 
+# Columns returned by the anomaly queries, joined with their traffic record
+ANOMALY_COLUMNS = '''
+    a.anomaly_id, a.log_id, a.device_id, a.type_id, a.score, a.is_genuine, a.model_used, a.detected_at,
+    t.source_ip, t.dest_ip, t.protocol, t.service, t.attack_type
+'''
+
+# Bytes of CSV parsed into each record batch during import (~50k traffic rows)
+IMPORT_BLOCK_SIZE = 8 << 20
+
 # Ensure database directory exists
 os.makedirs(DB_DIR, exist_ok=True)
 
+# Per-thread persistent database connections
+_tls = threading.local()
+
 def get_db_connection():
     """
-    Get a connection to the SQLite database
+    Get the calling thread's connection to the SQLite database
+    
+    The connection is opened once per thread and reused. It runs in
+    autocommit mode (isolation_level=None), so multi-statement writes must
+    issue BEGIN explicitly.
     
     Returns:
         Connection object
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = getattr(_tls, 'conn', None)
+    
+    if conn is not None:
+        try:
+            # Raises if a caller closed the connection
+            conn.total_changes
+            return conn
+        except sqlite3.ProgrammingError:
+            pass
+    
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+    
+    _tls.conn = conn
     return conn
 
+def close_db():
+    """Close the calling thread's database connection, if open"""
+    conn = getattr(_tls, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _tls.conn = None
+
+atexit.register(close_db)
+
+def _create_indexes(cursor):
+    """
+    Create indexes on columns used by the anomaly queries
+    
+    Args:
+        cursor: Database cursor
+    """
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_anomalies_detected_at ON anomalies(detected_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_anomalies_log_id ON anomalies(log_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_anomalies_device_id ON anomalies(device_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_anomalies_model ON anomalies(model_used)')
+    
+    # Covers the anomaly join so traffic columns are read from the index alone
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_traffic_log_covering '
+        'ON traffic(log_id, source_ip, dest_ip, protocol, service, attack_type)'
+    )
+
 def init_db():
     """
     Initialize the database with required tables
@@ -103,8 +164,10 @@ def init_db():
         )
         ''')
         
+        # Create indexes
+        _create_indexes(cursor)
+        
         conn.commit()
-        conn.close()
         
         logger.info("Database initialized successfully")
         return True
@@ -113,6 +176,73 @@ def init_db():
         logger.error(f"Error initializing database: {str(e)}")
         return False
 
+def _sqlite_type(arrow_type):
+    """
+    Map an Arrow column type to a SQLite column type
+    
+    Args:
+        arrow_type: Arrow data type
+    
+    Returns:
+        SQLite type name
+    """
+    import pyarrow.types as patypes
+    
+    if patypes.is_integer(arrow_type) or patypes.is_boolean(arrow_type):
+        return 'INTEGER'
+    if patypes.is_floating(arrow_type):
+        return 'REAL'
+    return 'TEXT'
+
+def _import_csv_table(conn, table, csv_path):
+    """
+    Import a CSV file into a table, replacing the table's contents
+    
+    The file is streamed with Arrow's CSV reader and each record batch is
+    written straight to executemany as it is parsed, so memory use does not
+    grow with the size of the file. The caller must hold a transaction, so a
+    failed import leaves the previous table in place.
+    
+    Args:
+        conn: Database connection
+        table: Name of the table to import into
+        csv_path: Path to the CSV file
+    
+    Returns:
+        Number of rows imported
+    """
+    # Imported here so modules that only query the database skip loading pyarrow
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.types as patypes
+    
+    reader = pacsv.open_csv(csv_path, read_options=pacsv.ReadOptions(block_size=IMPORT_BLOCK_SIZE))
+    
+    # Keep timestamps as they appear in the CSV rather than as parsed datetimes
+    as_text = [patypes.is_timestamp(field.type) or patypes.is_date(field.type) for field in reader.schema]
+    
+    columns = ', '.join(
+        f'"{field.name}" {"TEXT" if text else _sqlite_type(field.type)}'
+        for field, text in zip(reader.schema, as_text)
+    )
+    placeholders = ', '.join('?' * len(as_text))
+    
+    conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+    conn.execute(f'CREATE TABLE "{table}" ({columns})')
+    
+    row_count = 0
+    for batch in reader:
+        conn.executemany(
+            f'INSERT INTO "{table}" VALUES ({placeholders})',
+            zip(*(
+                (column.cast(pa.string()) if text else column).to_pylist()
+                for column, text in zip(batch.columns, as_text)
+            ))
+        )
+        row_count += batch.num_rows
+    
+    return row_count
+
 def import_csv_to_db():
     """
     Import processed CSV data to the database
@@ -137,29 +267,37 @@ def import_csv_to_db():
         
         conn = get_db_connection()
         
-        # Import devices
-        devices_df = pd.read_csv(devices_path)
-        devices_df.to_sql('devices', conn, if_exists='replace', index=False)
-        
-        # Import traffic
-        traffic_df = pd.read_csv(traffic_path)
-        traffic_df.to_sql('traffic', conn, if_exists='replace', index=False)
-        
-        # Import links
-        links_df = pd.read_csv(links_path)
-        links_df.to_sql('links', conn, if_exists='replace', index=False)
-        
-        # Import anomalies
-        anomalies_df = pd.read_csv(anomalies_path)
-        anomalies_df.to_sql('anomalies', conn, if_exists='replace', index=False)
-        
-        conn.close()
+        # Bulk import: skip fsync on commit, skip foreign key checks
+        # on the already validated rows and give the page cache more room
+        foreign_keys = conn.execute('PRAGMA foreign_keys').fetchone()[0]
+        cache_size = conn.execute('PRAGMA cache_size').fetchone()[0]
+        conn.execute('PRAGMA synchronous=OFF')
+        conn.execute('PRAGMA foreign_keys=OFF')
+        conn.execute('PRAGMA cache_size=-200000')
+        
+        # Import all tables in one transaction, so a failure partway through
+        # rolls back to the previous tables instead of leaving them half filled
+        try:
+            with conn:
+                conn.execute('BEGIN')
+                device_count = _import_csv_table(conn, 'devices', devices_path)
+                traffic_count = _import_csv_table(conn, 'traffic', traffic_path)
+                link_count = _import_csv_table(conn, 'links', links_path)
+                anomaly_count = _import_csv_table(conn, 'anomalies', anomalies_path)
+                
+                # Replacing the tables dropped their indexes
+                _create_indexes(conn.cursor())
+        finally:
+            # The connection is reused, so restore its normal settings
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA foreign_keys={foreign_keys}')
+            conn.execute(f'PRAGMA cache_size={cache_size}')
         
         logger.info("Data imported to database successfully")
-        logger.info(f"Devices: {len(devices_df)}")
-        logger.info(f"Traffic records: {len(traffic_df)}")
-        logger.info(f"Links: {len(links_df)}")
-        logger.info(f"Anomalies: {len(anomalies_df)}")
+        logger.info(f"Devices: {device_count}")
+        logger.info(f"Traffic records: {traffic_count}")
+        logger.info(f"Links: {link_count}")
+        logger.info(f"Anomalies: {anomaly_count}")
         
         return True
     
@@ -181,11 +319,9 @@ def get_devices(limit=100):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute(f'SELECT * FROM devices LIMIT {limit}')
+        cursor.execute('SELECT * FROM devices LIMIT ?', (limit,))
         devices = [dict(row) for row in cursor.fetchall()]
         
-        conn.close()
-        
         return devices
     
     except Exception as e:
@@ -206,17 +342,44 @@ def get_traffic(limit=100):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute(f'SELECT * FROM traffic LIMIT {limit}')
+        cursor.execute('SELECT * FROM traffic LIMIT ?', (limit,))
         traffic = [dict(row) for row in cursor.fetchall()]
         
-        conn.close()
-        
         return traffic
     
     except Exception as e:
         logger.error(f"Error getting traffic data: {str(e)}")
         return []
 
+def get_traffic_frame(limit=100):
+    """
+    Get traffic data from the database as a DataFrame
+    
+    The frame is built from the row tuples and column names, rather than
+    from a list of per-record dicts.
+    
+    Args:
+        limit: Maximum number of records to return
+    
+    Returns:
+        DataFrame of traffic records
+    """
+    # Imported here so modules that only query the database skip loading pandas
+    import pandas as pd
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM traffic LIMIT ?', (limit,))
+        columns = [col[0] for col in cursor.description]
+        
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+    
+    except Exception as e:
+        logger.error(f"Error getting traffic data: {str(e)}")
+        return pd.DataFrame()
+
 def get_anomalies(limit=100):
     """
     Get anomalies from the database
@@ -232,15 +395,14 @@ def get_anomalies(limit=100):
         cursor = conn.cursor()
         
         cursor.execute(f'''
-        SELECT a.*, t.source_ip, t.dest_ip, t.protocol, t.service, t.attack_type
+        SELECT {ANOMALY_COLUMNS}
         FROM anomalies a
         JOIN traffic t ON a.log_id = t.log_id
-        LIMIT {limit}
-        ''')
+        ORDER BY a.detected_at DESC
+        LIMIT ?
+        ''', (limit,))
         anomalies = [dict(row) for row in cursor.fetchall()]
         
-        conn.close()
-        
         return anomalies
     
     except Exception as e:
@@ -278,7 +440,6 @@ def add_anomaly(anomaly):
         anomaly_id = cursor.lastrowid
         
         conn.commit()
-        conn.close()
         
         return anomaly_id
     
@@ -299,35 +460,56 @@ def insert_anomalies(anomalies_df):
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        count = 0
         
-        for _, row in anomalies_df.iterrows():
-            # Extract device ID
-            device_id = row['device_id']
-            
-            # Get or create log ID
-            cursor.execute(
-                "INSERT INTO traffic_logs (device_id, timestamp, source_ip, source_port, dest_ip, dest_port, protocol) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (device_id, row['timestamp'], row['src_ip'], row['src_port'], row['dst_ip'], row['dst_port'], row['protocol'])
-            )
-            log_id = cursor.lastrowid
+        # Pull each column out once as plain Python values instead of
+        # building a row object per anomaly
+        num_rows = len(anomalies_df)
+        device_ids = anomalies_df['device_id'].tolist()
+        
+        # sqlite3 cannot bind pandas Timestamps, so datetime columns are
+        # stored as text in the format used by the rest of the database
+        timestamps = anomalies_df['timestamp']
+        if timestamps.dtype.kind == 'M':
+            timestamps = timestamps.dt.strftime('%Y-%m-%d %H:%M:%S')
+        timestamps = timestamps.tolist()
+        
+        # Calculate score from the first available model score column
+        score_column = next(
+            (column for column in ('combined_score', 'if_score', 'lof_score') if column in anomalies_df.columns),
+            None
+        )
+        scores = anomalies_df[score_column].tolist() if score_column else [0.5] * num_rows
+        models = anomalies_df['model_used'].tolist() if 'model_used' in anomalies_df.columns else ['generic'] * num_rows
+        
+        # One write transaction covers both tables; the connection context
+        # commits on success and rolls back on error
+        with conn:
+            cursor.execute("BEGIN IMMEDIATE")
             
-            # Calculate score
-            score = row.get('combined_score', row.get('if_score', row.get('lof_score', 0.5)))
+            # Assign log IDs client-side under the write lock so both tables
+            # can be batch inserted without racing other writers
+            cursor.execute("SELECT COALESCE(MAX(log_id), 0) FROM traffic")
+            first_log_id = cursor.fetchone()[0] + 1
+            log_ids = range(first_log_id, first_log_id + num_rows)
             
-            # Insert anomaly
-            cursor.execute(
+            cursor.executemany(
+                "INSERT INTO traffic (log_id, device_id, timestamp, source_ip, source_port, dest_ip, dest_port, protocol) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    log_ids, device_ids, timestamps,
+                    anomalies_df['src_ip'].tolist(), anomalies_df['src_port'].tolist(),
+                    anomalies_df['dst_ip'].tolist(), anomalies_df['dst_port'].tolist(),
+                    anomalies_df['protocol'].tolist()
+                )
+            )
+            cursor.executemany(
                 "INSERT INTO anomalies (log_id, device_id, type_id, score, is_genuine, model_used, detected_at) "
                 "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (log_id, device_id, 1, score, True, row.get('model_used', 'generic'), row['timestamp'])
+                zip(log_ids, device_ids, [1] * num_rows, scores, [True] * num_rows, models, timestamps)
             )
-            
-            count += 1
         
-        conn.commit()
-        logger.info(f"Inserted {count} anomalies into the database")
-        return count
+        logger.info(f"Inserted {num_rows} anomalies into the database")
+        return num_rows
     
     except Exception as e:
         logger.error(f"Error inserting anomalies: {str(e)}")
@@ -349,8 +531,8 @@ def get_anomalies_by_timerange(start_time, end_time, limit=100):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-        SELECT a.*, t.source_ip, t.dest_ip, t.protocol, t.service, t.attack_type
+        cursor.execute(f'''
+        SELECT {ANOMALY_COLUMNS}
         FROM anomalies a
         JOIN traffic t ON a.log_id = t.log_id
         WHERE a.detected_at BETWEEN ? AND ?
@@ -360,8 +542,6 @@ def get_anomalies_by_timerange(start_time, end_time, limit=100):
         
         anomalies = [dict(row) for row in cursor.fetchall()]
         
-        conn.close()
-        
         return anomalies
     
     except Exception as e:
@@ -399,24 +579,10 @@ def get_anomaly_statistics(days=7):
         
         daily_counts = {row['day']: row['count'] for row in cursor.fetchall()}
         
-        # Get count by model
+        # Get counts by model and device pair from a single scan of the window
         cursor.execute('''
             SELECT 
                 model_used,
-                COUNT(*) as count
-            FROM 
-                anomalies
-            WHERE 
-                detected_at >= date('now', ?)
-            GROUP BY 
-                model_used
-        ''', (f'-{days} days',))
-        
-        model_counts = {row['model_used']: row['count'] for row in cursor.fetchall()}
-        
-        # Get count by device
-        cursor.execute('''
-            SELECT 
                 device_id,
                 COUNT(*) as count
             FROM 
@@ -424,27 +590,19 @@ def get_anomaly_statistics(days=7):
             WHERE 
                 detected_at >= date('now', ?)
             GROUP BY 
-                device_id
-            ORDER BY 
-                count DESC
-            LIMIT 10
+                model_used, device_id
         ''', (f'-{days} days',))
         
-        device_counts = {row['device_id']: row['count'] for row in cursor.fetchall()}
+        model_counts = Counter()
+        device_counts = Counter()
+        for row in cursor.fetchall():
+            model_counts[row['model_used']] += row['count']
+            device_counts[row['device_id']] += row['count']
+        model_counts = dict(model_counts)
+        device_counts = dict(device_counts.most_common(10))
         
-        # Get total count
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total
-            FROM 
-                anomalies
-            WHERE 
-                detected_at >= date('now', ?)
-        ''', (f'-{days} days',))
-        
-        total = cursor.fetchone()['total']
-        
-        conn.close()
+        # Every anomaly in the window falls in exactly one day group
+        total = sum(daily_counts.values())
         
         return {
             'total': total,
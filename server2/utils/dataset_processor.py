@@ -5,8 +5,13 @@ This script downloads and processes a subset of the IoT-23 dataset,
 transforming it to match our database schema.
 """
 import os
+import csv
+import logging
+from collections import Counter
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
 from utils.logger import get_logger
 
@@ -18,19 +23,204 @@ DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 DATASET_DIR = os.path.join(DATA_DIR, 'iot23')
 PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
 
+# Fields of an IoT-23 conn.log.labeled line
+IOT23_FIELDS = [
+    'ts', 'uid', 'id.orig_h', 'id.orig_p', 'id.resp_h', 'id.resp_p',
+    'proto', 'service', 'duration', 'orig_bytes', 'resp_bytes',
+    'conn_state', 'local_orig', 'local_resp', 'missed_bytes',
+    'history', 'orig_pkts', 'orig_ip_bytes', 'resp_pkts',
+    'resp_ip_bytes', 'tunnel_parents', 'label', 'detailed_label'
+]
+
+# Extra fields a malformed line may carry. They are read into spare columns
+# so the line parses like any other
+SPARE_FIELDS = [f'extra_{i}' for i in range(1, 9)]
+
+# Fields that may hold the label and detailed label of a line with extra fields
+LABEL_FIELDS = ['label', 'detailed_label'] + SPARE_FIELDS
+
+# Number of log lines parsed and written per chunk
+CHUNKSIZE = 500_000
+
+# IoT-23 field names mapped to our traffic column names
+IOT23_COLUMN_NAMES = {
+    'ts': 'timestamp',
+    'uid': 'uid',
+    'id.orig_h': 'source_ip',
+    'id.orig_p': 'source_port',
+    'id.resp_h': 'dest_ip',
+    'id.resp_p': 'dest_port',
+    'proto': 'protocol',
+    'service': 'service',
+    'duration': 'duration',
+    'orig_bytes': 'orig_bytes',
+    'resp_bytes': 'resp_bytes',
+    'conn_state': 'conn_state'
+}
+
+# Column types of the streamed traffic and anomaly outputs. Fixed up front so
+# every chunk is written the same way, even when a chunk has no rows
+TRAFFIC_SCHEMA = pa.schema([
+    ('timestamp', pa.string()),
+    ('uid', pa.string()),
+    ('source_ip', pa.string()),
+    ('source_port', pa.string()),
+    ('dest_ip', pa.string()),
+    ('dest_port', pa.string()),
+    ('protocol', pa.string()),
+    ('service', pa.string()),
+    ('duration', pa.float64()),
+    ('orig_bytes', pa.int64()),
+    ('resp_bytes', pa.int64()),
+    ('conn_state', pa.string()),
+    ('label', pa.string()),
+    ('attack_type', pa.string()),
+    ('log_id', pa.int64()),
+    ('link_id', pa.int64()),
+    ('device_id', pa.int64()),
+    ('packet_size', pa.int64())
+])
+ANOMALY_SCHEMA = pa.schema(list(TRAFFIC_SCHEMA) + [
+    ('anomaly_id', pa.int64()),
+    ('type_id', pa.int64()),
+    ('score', pa.float64()),
+    ('is_genuine', pa.bool_()),
+    ('model_used', pa.string()),
+    ('detected_at', pa.string())
+])
+
 # Ensure directories exist
 os.makedirs(DATASET_DIR, exist_ok=True)
 os.makedirs(PROCESSED_DIR, exist_ok=True)
 
+def _write_csv(df, file_path):
+    """
+    Write a DataFrame to CSV with Arrow's multi-threaded C++ writer
+    
+    Args:
+        df: DataFrame to save
+        file_path: Path to save the file
+    """
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), file_path)
+
+class _CSVAppender:
+    """Appends DataFrame chunks to a CSV file with Arrow's C++ writer."""
+    def __init__(self, file_path, schema):
+        self.schema = schema
+        self.writer = pacsv.CSVWriter(file_path, schema)
+    
+    def append(self, df):
+        """Write a chunk, converting its columns to the file's schema."""
+        self.writer.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+    
+    def close(self):
+        self.writer.close()
+
+def _iter_iot23_log(file_path):
+    """
+    Read an IoT-23 conn.log.labeled file in chunks
+    
+    The file is a tab-separated Zeek log with '#' header lines. It is
+    memory-mapped and parsed by the C engine as text; header and truncated
+    lines are skipped. Lines with extra fields take their label and detailed
+    label from their last two fields; lines with len(SPARE_FIELDS) or more
+    extra fields are skipped.
+    
+    Args:
+        file_path: Path to the dataset file
+    
+    Yields:
+        DataFrame chunks with one column per IoT-23 field
+    """
+    # Lines are split on tabs only; '#' and quotes inside fields are data
+    reader = pd.read_csv(
+        file_path,
+        sep='\t',
+        quoting=csv.QUOTE_NONE,
+        header=None,
+        names=IOT23_FIELDS + SPARE_FIELDS,
+        dtype=str,
+        keep_default_na=False,
+        # Fields missing from short lines are read as ''; treat them as NA
+        na_values={field: [''] for field in ['resp_ip_bytes'] + LABEL_FIELDS},
+        on_bad_lines='skip',
+        engine='c',
+        memory_map=True,
+        chunksize=CHUNKSIZE
+    )
+    extra_count = 0
+    with reader:
+        for chunk in reader:
+            # The C engine skips lines wider than all the spare fields, except at
+            # the start of a chunk where it truncates them; those fill the last one
+            chunk = chunk[
+                chunk['resp_ip_bytes'].notna()
+                & chunk[SPARE_FIELDS[-1]].isna()
+                & ~chunk['ts'].str.startswith('#')
+            ]
+            
+            extra = chunk[SPARE_FIELDS].notna().any(axis=1)
+            if extra.any():
+                extra_count += int(extra.sum())
+                chunk = chunk.copy()
+                chunk.loc[extra, ['label', 'detailed_label']] = [
+                    _last_two(fields) for fields in chunk.loc[extra, LABEL_FIELDS].to_numpy()
+                ]
+            
+            yield chunk[IOT23_FIELDS]
+    
+    if extra_count:
+        logger.warning(f"Read {extra_count} lines with extra fields, labelled from their last two fields")
+
+def _last_two(fields):
+    """
+    Get the last two present fields of a line with extra fields
+    
+    Args:
+        fields: Label and spare field values, NA where missing
+    
+    Returns:
+        List of the label and detailed label, NA where the line has too few fields
+    """
+    present = [field for field in fields if not pd.isna(field)]
+    return ([np.nan, np.nan] + present)[-2:]
+
+def _to_traffic(chunk):
+    """
+    Map a chunk of IoT-23 fields onto our traffic columns
+    
+    Args:
+        chunk: DataFrame chunk from _iter_iot23_log
+    
+    Returns:
+        DataFrame with the traffic columns
+    """
+    df = chunk[list(IOT23_COLUMN_NAMES)].rename(columns=IOT23_COLUMN_NAMES)
+    
+    # Missing ('-') or malformed numeric fields count as zero
+    df['duration'] = pd.to_numeric(df['duration'], errors='coerce').fillna(0.0)
+    for column in ('orig_bytes', 'resp_bytes'):
+        counts = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype='float64')
+        df[column] = np.where(counts % 1 == 0, counts, 0).astype('int64')
+    
+    # The last two fields contain the label (Malicious/Benign) and attack type
+    df['label'] = chunk['label'].fillna('Unknown')
+    df['attack_type'] = chunk['detailed_label'].fillna('-')
+    
+    return df
+
 def process_iot23_dataset(file_path=None):
     """
     Process the IoT-23 dataset to match our database schema
     
+    The log is streamed in chunks, so memory use does not grow with the size
+    of the file.
+    
     Args:
         file_path: Path to the dataset file
     
     Returns:
-        Dictionary containing processed dataframes
+        Dictionary mapping each processed table to its CSV path
     """
     if file_path is None:
         file_path = os.path.join(DATASET_DIR, 'conn.log.labeled')
@@ -42,153 +232,94 @@ def process_iot23_dataset(file_path=None):
     try:
         logger.info(f"Processing dataset: {file_path}")
         
-        # Read the dataset
-        # IoT-23 conn.log.labeled has a custom format, we need to parse it
-        # This is a simplified parser for demonstration
-        data = []
-        with open(file_path, 'r') as f:
-            for line in f:
-                if line.startswith('#'):
-                    continue
-                
-                # Parse the line
-                fields = line.strip().split('\t')
-                if len(fields) < 20:
-                    continue
-                
-                try:
-                    # Extract relevant fields
-                    timestamp = fields[0]
-                    uid = fields[1]
-                    source_ip = fields[2]
-                    source_port = fields[3]
-                    dest_ip = fields[4]
-                    dest_port = fields[5]
-                    protocol = fields[6]
-                    service = fields[7]
-                    duration = fields[8]
-                    orig_bytes = fields[9]
-                    resp_bytes = fields[10]
-                    conn_state = fields[11]
-                    
-                    # The last two fields contain the label and attack type
-                    if len(fields) >= 22:
-                        label = fields[-2]  # Second to last field is the label (Malicious/Benign)
-                        attack_type = fields[-1]  # Last field is the attack type
-                    else:
-                        label = 'Unknown'
-                        attack_type = '-'
-                    
-                    # Convert to appropriate types
-                    try:
-                        orig_bytes = int(orig_bytes) if orig_bytes != '-' else 0
-                        resp_bytes = int(resp_bytes) if resp_bytes != '-' else 0
-                        duration = float(duration) if duration != '-' else 0.0
-                    except:
-                        orig_bytes = 0
-                        resp_bytes = 0
-                        duration = 0.0
-                    
-                    # Add to data
-                    data.append({
-                        'timestamp': timestamp,
-                        'uid': uid,
-                        'source_ip': source_ip,
-                        'source_port': source_port,
-                        'dest_ip': dest_ip,
-                        'dest_port': dest_port,
-                        'protocol': protocol,
-                        'service': service,
-                        'duration': duration,
-                        'orig_bytes': orig_bytes,
-                        'resp_bytes': resp_bytes,
-                        'conn_state': conn_state,
-                        'label': label,
-                        'attack_type': attack_type
-                    })
-                except Exception as e:
-                    logger.warning(f"Error parsing line: {str(e)}")
-                    continue
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
+        paths = {
+            table: os.path.join(PROCESSED_DIR, f'{table}.csv')
+            for table in ('devices', 'traffic', 'links', 'anomalies')
+        }
         
         # Process the data to match our schema
         
-        # 1. Extract devices (db_device)
-        devices = set(df['source_ip'].unique()) | set(df['dest_ip'].unique())
+        # 1.-4. Stream devices (db_device), traffic (db_traffic_devices), links
+        # (db_link) and anomalies (db_device_anomalies) chunk by chunk.
+        # Device ids are the 1-based positions of the IPs, in order of first appearance
+        device_ips = pd.Index([], dtype=object)
+        traffic_writer = _CSVAppender(paths['traffic'], TRAFFIC_SCHEMA)
+        anomaly_writer = _CSVAppender(paths['anomalies'], ANOMALY_SCHEMA)
+        link_chunks = []
+        # Label/attack type breakdowns are only collected for debug logging
+        debug = logger.isEnabledFor(logging.DEBUG)
+        label_counts = Counter()
+        attack_counts = Counter()
+        traffic_count = 0
+        anomaly_count = 0
+        
+        try:
+            for chunk in _iter_iot23_log(file_path):
+                traffic_df = _to_traffic(chunk)
+                
+                chunk_ips = pd.Index(pd.unique(pd.concat([traffic_df['source_ip'], traffic_df['dest_ip']])))
+                device_ips = device_ips.append(chunk_ips[~chunk_ips.isin(device_ips)])
+                
+                traffic_df['log_id'] = range(traffic_count + 1, traffic_count + len(traffic_df) + 1)
+                traffic_df['link_id'] = 1  # Default link
+                traffic_df['device_id'] = pd.Categorical(traffic_df['source_ip'], categories=device_ips).codes.astype('int64') + 1
+                traffic_df['packet_size'] = traffic_df['orig_bytes'] + traffic_df['resp_bytes']
+                traffic_count += len(traffic_df)
+                
+                # Distinct source/destination device pairs of this chunk
+                dest_ids = pd.Categorical(traffic_df['dest_ip'], categories=device_ips).codes.astype('int64') + 1
+                link_chunks.append(pd.DataFrame({
+                    'abonent_id': traffic_df['device_id'],
+                    'address_id': dest_ids
+                }).drop_duplicates())
+                
+                if debug:
+                    label_counts.update(traffic_df['label'].value_counts().to_dict())
+                    attack_counts.update(traffic_df['attack_type'].value_counts().to_dict())
+                
+                # Check for malicious entries; the boolean mask already yields a new frame
+                anomaly_df = traffic_df[traffic_df['label'] == 'Malicious']
+                anomaly_df = anomaly_df.assign(
+                    anomaly_id=range(anomaly_count + 1, anomaly_count + len(anomaly_df) + 1),
+                    type_id=1,  # Default type
+                    score=0.9,  # High confidence for labeled anomalies
+                    is_genuine=True,
+                    model_used='IoT-23 Labels',
+                    detected_at=anomaly_df['timestamp']
+                )
+                anomaly_count += len(anomaly_df)
+                
+                traffic_writer.append(traffic_df)
+                anomaly_writer.append(anomaly_df)
+        finally:
+            traffic_writer.close()
+            anomaly_writer.close()
+        
         device_df = pd.DataFrame({
-            'device_id': range(1, len(devices) + 1),
-            'ip_address': list(devices),
+            'device_id': range(1, len(device_ips) + 1),
+            'ip_address': device_ips,
             'type_id': 1,  # Default type
             'status': True,
             'last_seen': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         })
+        _write_csv(device_df, paths['devices'])
         
-        # Create a mapping of IP to device_id
-        ip_to_device_id = dict(zip(device_df['ip_address'], device_df['device_id']))
-        
-        # 2. Create traffic data (db_traffic_devices)
-        traffic_df = df.copy()
-        traffic_df['log_id'] = range(1, len(traffic_df) + 1)
-        traffic_df['link_id'] = 1  # Default link
-        traffic_df['device_id'] = traffic_df['source_ip'].map(ip_to_device_id)
-        traffic_df['packet_size'] = traffic_df['orig_bytes'] + traffic_df['resp_bytes']
-        
-        # 3. Create links (db_link)
-        links = []
-        for _, row in traffic_df.iterrows():
-            source_id = ip_to_device_id.get(row['source_ip'], 0)
-            dest_id = ip_to_device_id.get(row['dest_ip'], 0)
-            
-            if source_id > 0 and dest_id > 0:
-                links.append((source_id, dest_id))
-        
-        unique_links = list(set(links))
-        link_df = pd.DataFrame({
-            'id': range(1, len(unique_links) + 1),
-            'abonent_id': [link[0] for link in unique_links],
-            'address_id': [link[1] for link in unique_links]
-        })
-        
-        # 4. Create anomalies (db_device_anomalies)
-        # Print sample data for debugging
-        print("\nSample labels from dataset:")
-        print(df['label'].value_counts())
-        
-        if 'attack_type' in df.columns:
-            print("\nSample attack types:")
-            print(df['attack_type'].value_counts())
-        
-        # Check for malicious entries
-        anomaly_df = traffic_df[traffic_df['label'] == 'Malicious'].copy()
-        print(f"\nFound {len(anomaly_df)} malicious entries")
+        link_df = pd.concat(link_chunks).drop_duplicates().reset_index(drop=True)
+        link_df.insert(0, 'id', range(1, len(link_df) + 1))
+        _write_csv(link_df, paths['links'])
         
-        anomaly_df['anomaly_id'] = range(1, len(anomaly_df) + 1) if len(anomaly_df) > 0 else []
-        anomaly_df['type_id'] = 1  # Default type
-        anomaly_df['score'] = 0.9  # High confidence for labeled anomalies
-        anomaly_df['is_genuine'] = True
-        anomaly_df['model_used'] = 'IoT-23 Labels'
-        anomaly_df['detected_at'] = anomaly_df['timestamp']
-        
-        # Save processed data
-        device_df.to_csv(os.path.join(PROCESSED_DIR, 'devices.csv'), index=False)
-        traffic_df.to_csv(os.path.join(PROCESSED_DIR, 'traffic.csv'), index=False)
-        link_df.to_csv(os.path.join(PROCESSED_DIR, 'links.csv'), index=False)
-        anomaly_df.to_csv(os.path.join(PROCESSED_DIR, 'anomalies.csv'), index=False)
+        # Log sample data for debugging
+        if debug:
+            logger.debug(f"Sample labels from dataset:\n{pd.Series(label_counts, name='count').sort_values(ascending=False)}")
+            logger.debug(f"Sample attack types:\n{pd.Series(attack_counts, name='count').sort_values(ascending=False)}")
         
         logger.info(f"Dataset processed successfully")
         logger.info(f"Devices: {len(device_df)}")
-        logger.info(f"Traffic records: {len(traffic_df)}")
+        logger.info(f"Traffic records: {traffic_count}")
         logger.info(f"Links: {len(link_df)}")
-        logger.info(f"Anomalies: {len(anomaly_df)}")
+        logger.info(f"Anomalies: {anomaly_count}")
         
-        return {
-            'devices': device_df,
-            'traffic': traffic_df,
-            'links': link_df,
-            'anomalies': anomaly_df
-        }
+        return paths
     
     except Exception as e:
         logger.error(f"Error processing dataset: {str(e)}")
@@ -210,26 +341,24 @@ def create_training_data():
             logger.error("Processed data not found. Run process_iot23_dataset first.")
             return None
         
-        traffic_df = pd.read_csv(traffic_path)
-        anomalies_df = pd.read_csv(anomalies_path)
-        
-        # Create a set of anomalous log_ids
-        anomalous_logs = set(anomalies_df['log_id'])
-        
-        # Add a label column to the traffic data
-        traffic_df['is_anomaly'] = traffic_df['log_id'].apply(lambda x: x in anomalous_logs)
-        
         # Extract features for training
         features = [
             'device_id', 'packet_size', 'duration', 'orig_bytes', 'resp_bytes'
         ]
         
+        # Read only the columns we need, with the multi-threaded Arrow parser
+        traffic_df = pd.read_csv(traffic_path, usecols=features + ['log_id'], engine='pyarrow')
+        anomalies_df = pd.read_csv(anomalies_path, usecols=['log_id'], engine='pyarrow')
+        
+        # Add a label column to the traffic data
+        traffic_df['is_anomaly'] = traffic_df['log_id'].isin(anomalies_df['log_id'].to_numpy())
+        
         # Create training data
         training_df = traffic_df[features + ['is_anomaly']].copy()
         
         # Save training data
         training_path = os.path.join(DATA_DIR, 'training_data.csv')
-        training_df.to_csv(training_path, index=False)
+        _write_csv(training_df, training_path)
         
         logger.info(f"Training data created: {training_path}")
         logger.info(f"Total records: {len(training_df)}")
@@ -67,9 +67,7 @@ def get_logger():
     Returns:
         Logger instance
     """
-    global _logger
-    
-    if _logger is None:
-        _logger = setup_logger()
-    
     return _logger
+
+# Configure the logger at import so get_logger is a plain lookup
+setup_logger()
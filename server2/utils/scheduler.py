@@ -7,6 +7,7 @@ using FastAPI's background tasks and APScheduler.
 import asyncio
 from datetime import datetime
 from typing import Dict, Any, Callable, List, Optional
+from apscheduler.job import Job
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
@@ -25,7 +26,7 @@ scheduler = AsyncIOScheduler(
 )
 
 # Store for active jobs
-active_jobs: Dict[str, str] = {}
+active_jobs: Dict[str, Job] = {}
 
 def initialize_scheduler():
     """Initialize the scheduler and start it"""
@@ -86,8 +87,8 @@ def schedule_interval_task(
         replace_existing=True
     )
     
-    # Store job ID
-    active_jobs[task_id] = job.id
+    # Store job
+    active_jobs[task_id] = job
     
     logger.info(f"Scheduled interval task '{task_id}' with ID {job.id}")
     
@@ -126,8 +127,8 @@ def schedule_cron_task(
         replace_existing=True
     )
     
-    # Store job ID
-    active_jobs[task_id] = job.id
+    # Store job
+    active_jobs[task_id] = job
     
     logger.info(f"Scheduled cron task '{task_id}' with ID {job.id}")
     
@@ -167,8 +168,11 @@ def get_active_tasks() -> Dict[str, Any]:
     """
     tasks = {}
     
-    for job_id in active_jobs.values():
-        job = scheduler.get_job(job_id)
+    # Fetch current job state in a single pass over the job store
+    jobs = {job.id: job for job in scheduler.get_jobs()}
+    
+    for cached_job in active_jobs.values():
+        job = jobs.get(cached_job.id)
         
         if job:
             tasks[job.id] = {
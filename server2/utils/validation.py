@@ -6,15 +6,34 @@ in a consistent way across the application.
 """
 import re
 import json
+import socket
 import ipaddress
+import orjson
 from datetime import datetime
 from functools import wraps
-from flask import request, jsonify
+from flask import request, Response
 from utils.logger import get_logger
 
 # Get logger
 logger = get_logger()
 
+# Zero-padded timestamps checked on the fast path: YYYY-MM-DD with an optional
+# 'T' or space separated HH:MM:SS
+_TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}:\d{2})?\Z')
+
+def _json_response(body, status_code):
+    """
+    Build a JSON response encoded with orjson
+    
+    Args:
+        body: Dictionary to send
+        status_code: HTTP status code
+    
+    Returns:
+        Flask Response
+    """
+    return Response(orjson.dumps(body), status=status_code, mimetype='application/json')
+
 class ValidationError(Exception):
     """Exception raised for validation errors"""
     def __init__(self, message, field=None, status_code=400):
@@ -23,10 +42,94 @@ class ValidationError(Exception):
         self.status_code = status_code
         super().__init__(self.message)
 
+# Python types and error wording for each schema type name
+_TYPE_MAP = {
+    'str': (str, 'a string'),
+    'int': (int, 'an integer'),
+    'float': ((int, float), 'a number'),
+    'bool': (bool, 'a boolean'),
+    'list': (list, 'an array'),
+    'dict': (dict, 'an object')
+}
+
+def _compile_field(field, rules):
+    """
+    Build the checks for one schema field
+    
+    Only the rules present in the schema produce a check, so a request runs
+    no lookups for rules the field does not have.
+    
+    Args:
+        field: Field name
+        rules: Dictionary of validation rules for the field
+    
+    Returns:
+        List of functions that take the field value and return an error message or None
+    """
+    checks = []
+    
+    # Check type
+    if rules.get('type') in _TYPE_MAP:
+        expected_type, description = _TYPE_MAP[rules['type']]
+        type_message = f"Field '{field}' must be {description}"
+        checks.append(lambda value: type_message if not isinstance(value, expected_type) else None)
+    
+    # Check min/max for numeric types
+    if 'min' in rules:
+        minimum = rules['min']
+        min_message = f"Field '{field}' must be at least {minimum}"
+        checks.append(lambda value: min_message if isinstance(value, (int, float)) and value < minimum else None)
+    if 'max' in rules:
+        maximum = rules['max']
+        max_message = f"Field '{field}' must be at most {maximum}"
+        checks.append(lambda value: max_message if isinstance(value, (int, float)) and value > maximum else None)
+    
+    # Check pattern for string types
+    if 'pattern' in rules:
+        pattern = re.compile(rules['pattern'])
+        pattern_message = f"Field '{field}' must match pattern: {rules['pattern']}"
+        checks.append(lambda value: pattern_message if isinstance(value, str) and not pattern.match(value) else None)
+    
+    # Check choices for any type
+    if 'choices' in rules:
+        choices = rules['choices']
+        choices_message = f"Field '{field}' must be one of: {', '.join(map(str, choices))}"
+        
+        # Hash lookup when all choices are hashable; the list keeps the message order
+        try:
+            choice_set = frozenset(choices)
+        except TypeError:
+            choice_set = None
+        
+        def check_choices(value):
+            try:
+                allowed = value in choice_set
+            except TypeError:
+                # No set of choices, or an unhashable value such as a list
+                allowed = value in choices
+            return None if allowed else choices_message
+        
+        checks.append(check_choices)
+    
+    # Check custom validator
+    if 'validator' in rules:
+        validator = rules['validator']
+        
+        def check_validator(value):
+            is_valid, error_message = validator(value)
+            return None if is_valid else error_message
+        
+        checks.append(check_validator)
+    
+    return checks
+
 def validate_request_json(schema):
     """
     Decorator for validating JSON request data against a schema
     
+    The schema is compiled into per-field checks once, when the decorator is
+    applied, rather than interpreted on every request.
+    
     Args:
         schema: Dictionary defining the expected schema
                Each key is a field name, and the value is a dictionary with:
@@ -40,6 +143,11 @@ def validate_request_json(schema):
     Returns:
         Decorator function
     """
+    fields = [
+        (field, rules.get('required', False), _compile_field(field, rules))
+        for field, rules in schema.items()
+    ]
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -48,108 +156,41 @@ def validate_request_json(schema):
             
             # Check if data is None
             if data is None:
-                return jsonify({
+                return _json_response({
                     'status': 'error',
                     'message': 'No JSON data provided'
-                }), 400
+                }, 400)
             
             # Validate against schema
             errors = []
             
-            for field, rules in schema.items():
-                # Check if field is required
-                required = rules.get('required', False)
-                if required and field not in data:
-                    errors.append({
-                        'field': field,
-                        'message': f"Field '{field}' is required"
-                    })
-                    continue
-                
-                # Skip validation if field is not present
+            for field, required, checks in fields:
+                # Skip validation if field is not present, unless it is required
                 if field not in data:
-                    continue
-                
-                value = data[field]
-                
-                # Check type
-                expected_type = rules.get('type')
-                if expected_type:
-                    if expected_type == 'str' and not isinstance(value, str):
-                        errors.append({
-                            'field': field,
-                            'message': f"Field '{field}' must be a string"
-                        })
-                    elif expected_type == 'int' and not isinstance(value, int):
-                        errors.append({
-                            'field': field,
-                            'message': f"Field '{field}' must be an integer"
-                        })
-                    elif expected_type == 'float' and not isinstance(value, (int, float)):
-                        errors.append({
-                            'field': field,
-                            'message': f"Field '{field}' must be a number"
-                        })
-                    elif expected_type == 'bool' and not isinstance(value, bool):
+                    if required:
                         errors.append({
                             'field': field,
-                            'message': f"Field '{field}' must be a boolean"
-                        })
-                    elif expected_type == 'list' and not isinstance(value, list):
-                        errors.append({
-                            'field': field,
-                            'message': f"Field '{field}' must be an array"
-                        })
-                    elif expected_type == 'dict' and not isinstance(value, dict):
-                        errors.append({
-                            'field': field,
-                            'message': f"Field '{field}' must be an object"
-                        })
-                
-                # Check min/max for numeric types
-                if isinstance(value, (int, float)):
-                    if 'min' in rules and value < rules['min']:
-                        errors.append({
-                            'field': field,
-                            'message': f"Field '{field}' must be at least {rules['min']}"
-                        })
-                    if 'max' in rules and value > rules['max']:
-                        errors.append({
-                            'field': field,
-                            'message': f"Field '{field}' must be at most {rules['max']}"
-                        })
-                
-                # Check pattern for string types
-                if isinstance(value, str) and 'pattern' in rules:
-                    if not re.match(rules['pattern'], value):
-                        errors.append({
-                            'field': field,
-                            'message': f"Field '{field}' must match pattern: {rules['pattern']}"
+                            'message': f"Field '{field}' is required"
                         })
+                    continue
                 
-                # Check choices for any type
-                if 'choices' in rules and value not in rules['choices']:
-                    errors.append({
-                        'field': field,
-                        'message': f"Field '{field}' must be one of: {', '.join(map(str, rules['choices']))}"
-                    })
+                value = data[field]
                 
-                # Check custom validator
-                if 'validator' in rules:
-                    is_valid, error_message = rules['validator'](value)
-                    if not is_valid:
+                for check in checks:
+                    message = check(value)
+                    if message is not None:
                         errors.append({
                             'field': field,
-                            'message': error_message
+                            'message': message
                         })
             
             # Return errors if any
             if errors:
-                return jsonify({
+                return _json_response({
                     'status': 'error',
                     'message': 'Validation failed',
                     'errors': errors
-                }), 400
+                }, 400)
             
             # Call the original function
             return f(*args, **kwargs)
@@ -160,6 +201,13 @@ def validate_request_json(schema):
 
 def validate_ip_address(value):
     """Validate IP address"""
+    # Fast path for dotted-quad IPv4; it accepts a subset of what ipaddress does
+    try:
+        socket.inet_pton(socket.AF_INET, value)
+        return True, None
+    except (OSError, TypeError, ValueError):
+        pass
+    
     try:
         ipaddress.ip_address(value)
         return True, None
@@ -180,7 +228,15 @@ def validate_timestamp(value, format=None):
         if format:
             datetime.strptime(value, format)
         else:
-            # Try common formats
+            # Fast path: recognise the usual zero-padded shapes and parse once
+            if isinstance(value, str) and _TIMESTAMP_PATTERN.match(value):
+                try:
+                    datetime.fromisoformat(value)
+                    return True, None
+                except ValueError:
+                    pass
+            
+            # Try common formats, which also accept unpadded fields
             for fmt in ('%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
                 try:
                     datetime.strptime(value, fmt)
@@ -211,7 +267,7 @@ def handle_validation_error(e):
     if e.field:
         response['field'] = e.field
     
-    return jsonify(response), e.status_code
+    return _json_response(response, e.status_code)
 
 def setup_error_handlers(app):
     """Set up error handlers for the Flask application"""
@@ -221,29 +277,29 @@ def setup_error_handlers(app):
     
     @app.errorhandler(400)
     def handle_bad_request(e):
-        return jsonify({
+        return _json_response({
             'status': 'error',
             'message': 'Bad request: ' + str(e)
-        }), 400
+        }, 400)
     
     @app.errorhandler(404)
     def handle_not_found(e):
-        return jsonify({
+        return _json_response({
             'status': 'error',
             'message': 'Resource not found: ' + str(e)
-        }), 404
+        }, 404)
     
     @app.errorhandler(405)
     def handle_method_not_allowed(e):
-        return jsonify({
+        return _json_response({
             'status': 'error',
             'message': 'Method not allowed: ' + str(e)
-        }), 405
+        }, 405)
     
     @app.errorhandler(500)
     def handle_server_error(e):
         logger.error(f"Server error: {str(e)}")
-        return jsonify({
+        return _json_response({
             'status': 'error',
             'message': 'Internal server error'
-        }), 500
+        }, 500)
@@ -6,11 +6,15 @@ class SocketService {
     if (this.socket) return;
     const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
     this.socket = new WebSocket(`${protocol}://${window.location.host}/ws`);
+    this.socket.binaryType = 'arraybuffer';
+    const decoder = new TextDecoder();
 
     this.socket.onmessage = (event: MessageEvent) => {
       try {
-        const msg = JSON.parse(event.data);
-        this.notifyListeners(msg.event, msg.data);
+        const raw = typeof event.data === 'string' ? event.data : decoder.decode(event.data);
+        const msg = JSON.parse(raw);
+        const messages = Array.isArray(msg.batch) ? msg.batch : [msg];
+        messages.forEach((m: any) => this.notifyListeners(m.event, m.data));
       } catch (err) {
         console.error('Invalid WebSocket message', err);
       }